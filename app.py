@@ -1,22 +1,84 @@
+import startup  # first, so the startup timing covers the imports below
+
+import hmac
 import os
+import json
 from typing import Dict, Any, List, Tuple
 from functools import wraps
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import (
+    Flask,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    session,
+    jsonify,
+    Response,
+    stream_with_context,
+)
 from dotenv import load_dotenv
-from werkzeug.security import check_password_hash
 
-# Google Gemini
-import google.generativeai as genai
+import assets
 import auth_service
+import cache_service
+import db
+import http_cache
+import jobs
+import json_stream
+import meal_plan
+import metrics
+import password_hasher
+import rate_limit
 import recipe_service
+import singleflight
+
+STARTUP = startup.StartupTimer(started_at=startup.IMPORTED_AT)
+STARTUP.mark("imports")
 
 load_dotenv()
 
-app = Flask(__name__)
+# INSTANCE_PATH (absolute) moves the SQLite databases and caches elsewhere
+app = Flask(__name__, instance_path=os.environ.get("INSTANCE_PATH") or None)
 # Basic secret for flash messages (safe default). You may set FLASK_SECRET in .env
 app.secret_key = os.environ.get("FLASK_SECRET", "dev-secret-key")
 
+# Hashed, precompressed static files built by `python -m assets` (see /assets/...)
+ASSETS = assets.Assets(app.static_folder)
+ASSETS.init_app(app)
+
+# ETag/304 and gzip/brotli for rendered pages and JSON (streams are skipped)
+http_cache.init_app(
+    app,
+    min_size=int(os.environ.get("COMPRESS_MIN_SIZE", "1024")),
+    level=int(os.environ.get("COMPRESS_LEVEL", "6")),
+)
+
+# Request/stage timings for /metrics and Server-Timing; PROFILE_SAMPLE_RATE > 0
+# profiles that share of requests and keeps those slower than PROFILE_SLOW_SECONDS
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILER = (
+    metrics.SlowRequestProfiler(
+        os.environ.get("PROFILE_DIR") or os.path.join(app.instance_path, "profiles"),
+        sample_rate=PROFILE_SAMPLE_RATE,
+        threshold_seconds=float(os.environ.get("PROFILE_SLOW_SECONDS", "1.0")),
+        max_files=int(os.environ.get("PROFILE_MAX_FILES", "50")),
+    )
+    if PROFILE_SAMPLE_RATE > 0
+    else None
+)
+# Stage timings reveal e.g. whether a password was checked, so by default
+# only signed-in users get the header
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "session")
+metrics.init_app(
+    app,
+    server_timing=lambda: SERVER_TIMING == "all"
+    or (SERVER_TIMING == "session" and bool(session.get("logged_in"))),
+    profiler=PROFILER,
+)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 # SQLite setup for user authentication
 DB_PATH = os.path.join(app.instance_path, "auth.db")
 os.makedirs(app.instance_path, exist_ok=True)
@@ -31,16 +93,108 @@ def get_user_by_email(email: str):
 
 
 # Initialize DB on startup
-init_db()
+with STARTUP.phase("init_db"):
+    init_db()
+
+# Password hashing runs in worker processes so logins don't hog request threads
+PASSWORD_HASHER = password_hasher.PasswordHasher(
+    iterations=int(
+        os.environ.get(
+            "PASSWORD_HASH_ITERATIONS", str(password_hasher.DEFAULT_ITERATIONS)
+        )
+    ),
+    max_workers=int(os.environ.get("PASSWORD_HASH_WORKERS", "2")),
+    max_pending=int(os.environ.get("PASSWORD_HASH_QUEUE_DEPTH", "16")),
+    timeout_seconds=float(os.environ.get("PASSWORD_HASH_TIMEOUT", "5")),
+)
+
+# Recipe response cache (memory LRU + SQLite table that survives restarts)
+CACHE_DB_PATH = os.path.join(app.instance_path, "cache.db")
+RECIPE_CACHE = cache_service.RecipeCache(
+    CACHE_DB_PATH,
+    max_entries=int(os.environ.get("RECIPE_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.environ.get("RECIPE_CACHE_TTL", str(24 * 3600))),
+    max_rows=int(os.environ.get("RECIPE_CACHE_MAX_ROWS", "10000")),
+)
+
+# Identical generations already in progress are shared instead of repeated;
+# a duplicate waits at most GENERATION_COALESCE_TIMEOUT seconds
+GENERATION_FLIGHTS = singleflight.SingleFlight(
+    timeout_seconds=float(os.environ.get("GENERATION_COALESCE_TIMEOUT", "60"))
+)
+
+# Background generation jobs (see /generate/jobs)
+GENERATION_JOBS = jobs.JobQueue(
+    max_workers=int(os.environ.get("GENERATION_WORKERS", "4")),
+    max_pending=int(os.environ.get("GENERATION_QUEUE_DEPTH", "32")),
+    timeout_seconds=float(os.environ.get("GENERATION_JOB_TIMEOUT", "120")),
+)
+
+# Concurrent generations for /meal_plan, shared by all plans
+MEAL_PLANNER = meal_plan.MealPlanner(
+    max_workers=int(os.environ.get("MEAL_PLAN_WORKERS", "8")),
+    call_timeout_seconds=float(os.environ.get("MEAL_PLAN_CALL_TIMEOUT", "60")),
+)
+MEAL_PLAN_MAX_MEALS = int(os.environ.get("MEAL_PLAN_MAX_MEALS", "14"))
+
+# Per-client request limits ("<requests>/<seconds>", empty or 0 disables).
+# Set RATE_LIMIT_STORE=sqlite to share counters between worker processes.
+RATE_LIMITER = rate_limit.RateLimiter(
+    {
+        bucket: policy
+        for bucket, policy in {
+            "login": rate_limit.parse_policy(
+                os.environ.get("RATE_LIMIT_LOGIN", "10/60")
+            ),
+            "register": rate_limit.parse_policy(
+                os.environ.get("RATE_LIMIT_REGISTER", "5/300")
+            ),
+            "forgot_password": rate_limit.parse_policy(
+                os.environ.get("RATE_LIMIT_FORGOT_PASSWORD", "5/300")
+            ),
+            "generate": rate_limit.parse_policy(
+                os.environ.get("RATE_LIMIT_GENERATE", "30/60")
+            ),
+        }.items()
+        if policy is not None
+    },
+    store=(
+        rate_limit.SQLiteStore(os.path.join(app.instance_path, "ratelimit.db"))
+        if os.environ.get("RATE_LIMIT_STORE", "memory") == "sqlite"
+        else rate_limit.MemoryStore()
+    ),
+)
+# Endpoint -> bucket; all generation endpoints share one model-quota bucket
+RATE_LIMITED_ENDPOINTS = {
+    "login": "login",
+    "register": "register",
+    "forgot_password": "forgot_password",
+    "generate": "generate",
+    "generate_stream": "generate",
+    "create_generation_job": "generate",
+    "meal_plan_view": "generate",
+}
+
+# Upper bound on prompt length; the pantry list is trimmed to fit
+PROMPT_MAX_CHARS = int(os.environ.get("PROMPT_MAX_CHARS", "4000"))
 
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 
 if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
+    # Recorded now, applied when the Gemini SDK is first imported
+    recipe_service.genai.configure(api_key=GOOGLE_API_KEY)
 else:
     # Don't crash; allow UI to render a friendly warning
     pass
 
+STARTUP.mark("services")
+
+if os.environ.get("TEMPLATE_PRECOMPILE", "1") != "0":
+    with STARTUP.phase("templates"):
+        startup.precompile_templates(
+            app.jinja_env, os.path.join(app.instance_path, "jinja_cache")
+        )
+
 
 def get_model():
     return recipe_service.get_model()
@@ -66,21 +220,128 @@ RECIPE_JSON_SCHEMA: Dict[str, Any] = recipe_service.RECIPE_JSON_SCHEMA
 def build_prompt(
     user_query: str, available: List[str], servings: str, cuisine: str, time_pref: str
 ) -> str:
-    return recipe_service.build_prompt(
-        user_query, available, servings, cuisine, time_pref
+    # The schema is sent as response_schema, so it is left out of the prompt text
+    prompt, stats = recipe_service.build_prompt_with_stats(
+        user_query,
+        available,
+        servings,
+        cuisine,
+        time_pref,
+        include_schema=False,
+        max_chars=PROMPT_MAX_CHARS,
+    )
+    app.logger.info(
+        "Prompt size: %d chars (~%d tokens), %d pantry items, %d dropped",
+        stats["chars"],
+        stats["approx_tokens"],
+        stats["pantry_items"],
+        stats["pantry_dropped"],
     )
+    return prompt
 
 
 def safe_json_from_text(text: str) -> Dict[str, Any]:
     return recipe_service.safe_json_from_text(text)
 
 
+def generation_inputs() -> Tuple[str, List[str], str, str, str]:
+    """Read the recipe form: (query, parsed pantry, servings, cuisine, time_pref)."""
+    user_query = request.form.get("recipe_prompt", "").strip()
+    available_raw = request.form.get("available_ingredients", "").strip()
+    servings = request.form.get("servings", "").strip()
+    cuisine = request.form.get("cuisine", "").strip()
+    time_pref = request.form.get("time_pref", "").strip()
+    return (
+        user_query,
+        parse_available_ingredients(available_raw),
+        servings,
+        cuisine,
+        time_pref,
+    )
+
+
+def generation_config() -> Dict[str, Any]:
+    return recipe_service.GENERATION_CONFIG
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def cache_bypassed() -> bool:
+    """Per-request cache bypass via a form flag or ``Cache-Control: no-cache``."""
+    if request.form.get("bypass_cache"):
+        return True
+    return "no-cache" in request.headers.get("Cache-Control", "").lower()
+
+
+def produce_recipe(
+    user_query: str,
+    available: List[str],
+    servings: str,
+    cuisine: str,
+    time_pref: str,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Return a recipe for the inputs, from the cache or a fresh model call.
+
+    Runs outside the request context too (job workers), so it must not touch
+    ``request`` or ``flash``. Raises on model or parse failure.
+    """
+    cache_key = recipe_service.request_cache_key(
+        user_query, available, servings, cuisine, time_pref
+    )
+    with metrics.stage("cache"):
+        recipe = RECIPE_CACHE.get(cache_key) if use_cache else None
+    if recipe is not None:
+        return recipe
+
+    def generate() -> Dict[str, Any]:
+        with metrics.stage("prompt"):
+            prompt = build_prompt(user_query, available, servings, cuisine, time_pref)
+        recipe, fixes = recipe_service.generate_recipe(
+            get_model(), prompt, generation_config()
+        )
+        if fixes:
+            app.logger.info("Repaired model JSON: %s", "; ".join(fixes))
+        # Stored before the flight ends so later duplicates hit the cache
+        with metrics.stage("cache"):
+            RECIPE_CACHE.set(cache_key, recipe)
+        return recipe
+
+    if not use_cache:
+        return generate()
+    recipe, _shared = GENERATION_FLIGHTS.do(cache_key, generate)
+    return recipe
+
+
+def render_recipe(user_query: str, available: List[str], recipe: Dict[str, Any]):
+    with metrics.stage("diff"):
+        shopping, have_items = diff_shopping_list(
+            recipe.get("ingredients", []), available
+        )
+
+    with metrics.stage("render"):
+        return render_template(
+            "result.html",
+            query=user_query,
+            available=available,
+            recipe=recipe,
+            shopping_list=shopping,
+            have_items=have_items,
+        )
+
+
 def authenticate_user(email: str, password: str) -> bool:
-    return auth_service.authenticate_user(DB_PATH, email, password)
+    return auth_service.authenticate_user(
+        DB_PATH, email, password, hasher=PASSWORD_HASHER
+    )
 
 
 def create_user(name: str, email: str, password: str) -> bool:
-    return auth_service.create_user(DB_PATH, name, email, password)
+    return auth_service.create_user(
+        DB_PATH, name, email, password, hasher=PASSWORD_HASHER
+    )
 
 
 def login_required(f):
@@ -94,6 +355,32 @@ def login_required(f):
     return decorated
 
 
+@app.before_request
+def enforce_rate_limits():
+    bucket = RATE_LIMITED_ENDPOINTS.get(request.endpoint)
+    if bucket is None or request.method != "POST":
+        return None
+    cost = 1
+    if request.endpoint == "meal_plan_view":
+        # A plan costs one generation per meal
+        meals = meal_plan.split_meal_requests(
+            request.form.get("meals", ""), MEAL_PLAN_MAX_MEALS
+        )
+        cost = max(len(meals), 1)
+    retry_after = RATE_LIMITER.hit(
+        bucket,
+        rate_limit.identities(request.remote_addr, session.get("user_email")),
+        cost=cost,
+    )
+    if retry_after is None:
+        return None
+    return (
+        jsonify({"error": "Too many requests, please slow down."}),
+        429,
+        {"Retry-After": rate_limit.retry_after_header(retry_after)},
+    )
+
+
 @app.route("/home", methods=["GET"])
 @login_required
 def home():
@@ -109,6 +396,7 @@ def index():
 
 
 @app.route("/login", methods=["GET", "POST"])
+@http_cache.cacheable()
 def login():
     if request.method == "POST":
         email = request.form.get("email", "").strip()
@@ -118,8 +406,14 @@ def login():
             flash("Please enter both email and password.", "warning")
             return render_template("login.html")
 
-        row = get_user_by_email(email)
-        if row and check_password_hash(row["password_hash"], password):
+        try:
+            row = auth_service.verify_user(
+                DB_PATH, email, password, hasher=PASSWORD_HASHER
+            )
+        except password_hasher.PasswordHashError:
+            flash("Too many sign-ins right now. Please try again.", "warning")
+            return render_template("login.html"), 503
+        if row:
             session["user_email"] = row["email"]
             session["user_name"] = row["name"]
             session["logged_in"] = True
@@ -133,6 +427,7 @@ def login():
 
 # Disabling for now.
 @app.route("/register", methods=["GET", "POST"])
+@http_cache.cacheable()
 def register():
     if request.method == "POST":
         name = request.form.get("name", "").strip()
@@ -159,7 +454,12 @@ def register():
             return render_template("register.html")
 
         # Create user
-        if create_user(name, email, password):
+        try:
+            created = create_user(name, email, password)
+        except password_hasher.PasswordHashError:
+            flash("The server is busy. Please try again.", "warning")
+            return render_template("register.html"), 503
+        if created:
             session["user_email"] = email
             session["user_name"] = name
             session["logged_in"] = True
@@ -174,6 +474,7 @@ def register():
 
 
 @app.route("/forgot_password", methods=["GET", "POST"])
+@http_cache.cacheable()
 def forgot_password():
     if request.method == "POST":
         email = request.form.get("email", "").strip()
@@ -211,49 +512,303 @@ def generate():
         )
         return redirect(url_for("index"))
 
-    user_query = request.form.get("recipe_prompt", "").strip()
-    available_raw = request.form.get("available_ingredients", "").strip()
-    servings = request.form.get("servings", "").strip()
-    cuisine = request.form.get("cuisine", "").strip()
-    time_pref = request.form.get("time_pref", "").strip()
+    with metrics.stage("parse"):
+        user_query, available, servings, cuisine, time_pref = generation_inputs()
 
-    available = parse_available_ingredients(available_raw)
+    try:
+        recipe = produce_recipe(
+            user_query,
+            available,
+            servings,
+            cuisine,
+            time_pref,
+            use_cache=not cache_bypassed(),
+        )
+    except Exception as e:
+        flash(f"Failed to generate or parse recipe: {e}", "danger")
+        return redirect(url_for("index"))
 
-    model = get_model()
-    generation_config = {
-        "temperature": 0.8,
-        "top_p": 0.95,
-        "top_k": 40,
-        "response_mime_type": "application/json",
-        "response_schema": RECIPE_JSON_SCHEMA,
-    }
+    return render_recipe(user_query, available, recipe)
+
+
+@app.route("/generate/stream", methods=["POST"])
+@login_required
+def generate_stream():
+    """Server-Sent Events variant of ``generate``.
+
+    Emits ``field`` events for each completed top-level recipe field, ``item``
+    events for each ingredient/step/tip as soon as it is complete, then a
+    ``done`` event carrying the shopping list. Failures emit ``error``.
+    """
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if not GOOGLE_API_KEY:
+        message = (
+            "Missing GOOGLE_API_KEY in .env. Please configure it to generate recipes."
+        )
+        return Response(
+            sse_event("error", {"message": message}),
+            mimetype="text/event-stream",
+            headers=headers,
+        )
+
+    with metrics.stage("parse"):
+        user_query, available, servings, cuisine, time_pref = generation_inputs()
+    cache_key = recipe_service.request_cache_key(
+        user_query, available, servings, cuisine, time_pref
+    )
+    with metrics.stage("cache"):
+        cached = None if cache_bypassed() else RECIPE_CACHE.get(cache_key)
+
+    def events():
+        if cached is not None:
+            recipe = cached
+            for key, value in recipe.items():
+                if isinstance(value, list):
+                    for item in value:
+                        yield sse_event("item", {"key": key, "value": item})
+                yield sse_event("field", {"key": key, "value": value})
+        else:
+            parser = json_stream.IncrementalJSONParser()
+            with metrics.stage("prompt"):
+                prompt = build_prompt(
+                    user_query, available, servings, cuisine, time_pref
+                )
+            try:
+                response = get_model().generate_content(
+                    prompt, generation_config=generation_config(), stream=True
+                )
+                for chunk in response:
+                    for event in parser.feed(chunk.text):
+                        yield sse_event(
+                            event.kind, {"key": event.key, "value": event.value}
+                        )
+                # Repairs truncated output; may complete a last item or field
+                for event in parser.close():
+                    yield sse_event(
+                        event.kind, {"key": event.key, "value": event.value}
+                    )
+                if parser.fixes:
+                    app.logger.info("Repaired model JSON: %s", "; ".join(parser.fixes))
+                recipe = recipe_service.ensure_recipe_fields(parser.result)
+            except Exception as e:
+                message = f"Failed to generate or parse recipe: {e}"
+                yield sse_event("error", {"message": message})
+                return
+            RECIPE_CACHE.set(cache_key, recipe)
+
+        shopping, have_items = diff_shopping_list(recipe["ingredients"], available)
+        yield sse_event(
+            "done",
+            {"recipe": recipe, "shopping_list": shopping, "have_items": have_items},
+        )
+
+    return Response(
+        stream_with_context(events()), mimetype="text/event-stream", headers=headers
+    )
 
-    prompt = build_prompt(user_query, available, servings, cuisine, time_pref)
 
+@app.route("/generate/jobs", methods=["POST"])
+@login_required
+def create_generation_job():
+    """Queue a generation and return its id immediately (202).
+
+    Responds 429 with ``Retry-After`` when the queue is full.
+    """
+    if not GOOGLE_API_KEY:
+        return jsonify({"error": "Missing GOOGLE_API_KEY"}), 503
+
+    user_query, available, servings, cuisine, time_pref = generation_inputs()
     try:
-        response = model.generate_content(prompt, generation_config=generation_config)
+        job = GENERATION_JOBS.submit(
+            produce_recipe,
+            user_query,
+            available,
+            servings,
+            cuisine,
+            time_pref,
+            not cache_bypassed(),
+            owner=session.get("user_email"),
+            context=(user_query, available),
+        )
+    except jobs.QueueFull as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "5"}
+
+    status_url = url_for("generation_job", job_id=job.id)
+    return (
+        jsonify({**job.to_dict(), "status_url": status_url}),
+        202,
+        {"Location": status_url},
+    )
 
-        text = response.text
-        recipe = safe_json_from_text(text)
-    except Exception as e:
-        flash(f"Failed to generate or parse recipe: {e}", "danger")
-        return redirect(url_for("index"))
 
-    # Ensure basic fields exist
-    recipe.setdefault("title", "Your Custom Recipe")
-    recipe.setdefault("ingredients", [])
-    recipe.setdefault("steps", [])
+def owned_job(job_id: str):
+    job = GENERATION_JOBS.get(job_id)
+    if job is None or job.owner != session.get("user_email"):
+        return None
+    return job
 
-    shopping, have_items = diff_shopping_list(recipe.get("ingredients", []), available)
 
-    return render_template(
-        "result.html",
-        query=user_query,
-        available=available,
-        recipe=recipe,
-        shopping_list=shopping,
-        have_items=have_items,
+@app.route("/generate/jobs/<job_id>", methods=["GET"])
+@login_required
+def generation_job(job_id: str):
+    """Poll a job: 202 while pending, the rendered recipe once done.
+
+    ``?format=json`` returns the recipe as JSON instead of HTML.
+    """
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+
+    if job.status == jobs.DONE:
+        if request.args.get("format") == "json":
+            return jsonify({**job.to_dict(), "recipe": job.result})
+        user_query, available = job.context
+        return render_recipe(user_query, available, job.result)
+
+    status_codes = {
+        jobs.FAILED: 502,
+        jobs.TIMED_OUT: 504,
+        jobs.CANCELLED: 409,
+    }
+    if job.status in status_codes:
+        return jsonify(job.to_dict()), status_codes[job.status]
+    return jsonify(job.to_dict()), 202, {"Retry-After": "1"}
+
+
+@app.route("/generate/jobs/<job_id>", methods=["DELETE"])
+@app.route("/generate/jobs/<job_id>/cancel", methods=["POST"])
+@login_required
+def cancel_generation_job(job_id: str):
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    GENERATION_JOBS.cancel(job_id)
+    return jsonify(job.to_dict())
+
+
+@app.route("/generate/jobs/stats", methods=["GET"])
+@login_required
+def generation_job_stats():
+    return jsonify(GENERATION_JOBS.stats())
+
+
+@app.route("/meal_plan", methods=["GET", "POST"])
+@login_required
+def meal_plan_view():
+    """Generate one recipe per requested meal concurrently.
+
+    The form takes ``meals`` (one request per line) plus the usual pantry,
+    servings, cuisine and time fields. ``?format=json`` returns JSON.
+    """
+    if request.method == "GET":
+        return render_template("meal_plan.html", has_api_key=bool(GOOGLE_API_KEY))
+
+    wants_json = request.args.get("format") == "json"
+    if not GOOGLE_API_KEY:
+        if wants_json:
+            return jsonify({"error": "GOOGLE_API_KEY is not configured"}), 503
+        flash(
+            "Missing GOOGLE_API_KEY in .env. Please configure it to generate recipes.",
+            "danger",
+        )
+        return redirect(url_for("meal_plan_view"))
+
+    _query, available, servings, cuisine, time_pref = generation_inputs()
+    meals = meal_plan.split_meal_requests(
+        request.form.get("meals", ""), MEAL_PLAN_MAX_MEALS
     )
+    if not meals:
+        if wants_json:
+            return jsonify({"error": "Add at least one meal"}), 400
+        flash("Add at least one meal, one per line.", "warning")
+        return redirect(url_for("meal_plan_view"))
+
+    use_cache = not cache_bypassed()
+
+    def generate_meal(meal: str) -> Dict[str, Any]:
+        return produce_recipe(
+            meal, available, servings, cuisine, time_pref, use_cache=use_cache
+        )
+
+    plan = MEAL_PLANNER.plan(meals, available, generate_meal)
+    if wants_json:
+        return jsonify(plan)
+    return render_template("meal_plan.html", plan=plan, available=available)
+
+
+@app.route("/meal_plan/stats", methods=["GET"])
+@login_required
+def meal_plan_stats():
+    return jsonify(MEAL_PLANNER.stats())
+
+
+@app.route("/auth/stats", methods=["GET"])
+@login_required
+def auth_stats():
+    return jsonify(PASSWORD_HASHER.stats())
+
+
+@app.route("/rate_limits/stats", methods=["GET"])
+@login_required
+def rate_limit_stats():
+    return jsonify(RATE_LIMITER.stats())
+
+
+@app.route("/cache/stats", methods=["GET"])
+@login_required
+def cache_stats():
+    return jsonify(RECIPE_CACHE.stats())
+
+
+@app.route("/generate/coalescing/stats", methods=["GET"])
+@login_required
+def coalescing_stats():
+    return jsonify(GENERATION_FLIGHTS.stats())
+
+
+@app.route("/models/stats", methods=["GET"])
+@login_required
+def model_stats():
+    return jsonify(recipe_service.MODEL_REGISTRY.stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Prometheus scrape endpoint; set METRICS_TOKEN to require a bearer token."""
+    if METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"
+    ):
+        return Response("Unauthorized\n", 401, {"WWW-Authenticate": "Bearer"})
+    return Response(
+        metrics.render(),
+        headers={"Content-Type": metrics.PROMETHEUS_CONTENT_TYPE},
+    )
+
+
+@app.route("/health", methods=["GET"])
+def health():
+    checks = {
+        "auth_db": db.get_pool(DB_PATH).health(),
+        "cache_db": db.get_pool(CACHE_DB_PATH).health(),
+    }
+    ok = all(check["ok"] for check in checks.values())
+    return (
+        jsonify({"ok": ok, **checks, "startup": STARTUP.report()}),
+        200 if ok else 503,
+    )
+
+
+# "background" (default) imports the Gemini SDK and builds the model client
+# on a side thread after startup, "eager" does it before serving, "off"
+# waits for the first generation.
+MODEL_WARMUP = os.environ.get("MODEL_WARMUP", "background")
+if GOOGLE_API_KEY and MODEL_WARMUP == "eager":
+    with STARTUP.phase("model"):
+        recipe_service.get_model()
+STARTUP.mark("routes")
+STARTUP.log()
+if GOOGLE_API_KEY and MODEL_WARMUP == "background":
+    startup.warm_in_background(recipe_service.get_model, STARTUP, name="model")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,383 @@
+"""Static asset pipeline.
+
+``python -m assets`` vendors the third-party CSS/JS/fonts the templates use,
+prunes unused Font Awesome icon rules, minifies our CSS, writes
+content-hashed copies plus gzip/brotli variants to ``static/dist`` and
+records them in ``static/dist/manifest.json``.
+
+At runtime ``init_app`` adds an ``asset_url(name)`` template helper that
+returns the hashed URL when a build exists, and serves ``/assets/...``
+with long-lived immutable cache headers and precompressed variants.
+Without a build, ``asset_url`` falls back to ``/static`` (or the CDN for
+vendor files that have not been downloaded).
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+import sys
+import urllib.request
+from typing import Dict, Iterable, List, Optional, Set
+
+from flask import Flask, abort, request, send_from_directory, url_for
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - brotli variants are optional
+    brotli = None  # type: ignore
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+DIST_DIR = "dist"
+VENDOR_DIR = "vendor"
+MANIFEST_NAME = "manifest.json"
+
+# Logical name (relative to static/) -> pinned upstream URL
+VENDOR_ASSETS: Dict[str, str] = {
+    "vendor/bulma.min.css": "https://cdn.jsdelivr.net/npm/bulma@1.0.2/css/bulma.min.css",
+    "vendor/animate.min.css": "https://cdnjs.cloudflare.com/ajax/libs/animate.css/4.1.1/animate.min.css",
+    "vendor/fontawesome/css/all.min.css": "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/css/all.min.css",
+    "vendor/fontawesome/webfonts/fa-solid-900.woff2": "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/webfonts/fa-solid-900.woff2",
+    "vendor/fontawesome/webfonts/fa-regular-400.woff2": "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/webfonts/fa-regular-400.woff2",
+    "vendor/fontawesome/webfonts/fa-brands-400.woff2": "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/webfonts/fa-brands-400.woff2",
+    "vendor/confetti.browser.min.js": "https://cdn.jsdelivr.net/npm/canvas-confetti@1.9.3/dist/confetti.browser.min.js",
+    "vendor/fonts/inter.css": "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap",
+}
+# Stylesheets whose url(...) font files are downloaded next to them
+FONT_STYLESHEETS = {"vendor/fonts/inter.css"}
+ICON_STYLESHEET = "vendor/fontawesome/css/all.min.css"
+
+# Google Fonts only serves woff2 to browsers it recognises
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)"
+    " Chrome/124.0 Safari/537.36"
+)
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".ttf", ".ico")
+MIN_COMPRESS_BYTES = 256
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+mimetypes.add_type("font/woff2", ".woff2")
+
+_URL_RE = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+_ICON_RE = re.compile(r"\bfa-[a-z0-9-]+")
+_ICON_SELECTOR_RE = re.compile(r"^\.(fa-[a-z0-9-]+)(?:::?(?:before|after))?$")
+
+
+def _download(url: str) -> bytes:
+    req = urllib.request.Request(url, headers={"User-Agent": _USER_AGENT})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return response.read()
+
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def fetch_vendor(static_dir: str = STATIC_DIR, force: bool = False) -> List[str]:
+    """Download missing vendor files into ``static/vendor``; return their names."""
+    fetched = []
+    for name, url in VENDOR_ASSETS.items():
+        path = os.path.join(static_dir, name)
+        if os.path.exists(path) and not force:
+            continue
+        data = _download(url)
+        if name in FONT_STYLESHEETS:
+            data = _vendor_fonts(static_dir, name, data.decode("utf-8")).encode()
+        _write(path, data)
+        fetched.append(name)
+    return fetched
+
+
+def _vendor_fonts(static_dir: str, css_name: str, css: str) -> str:
+    """Download fonts referenced by absolute URLs and point the CSS at them."""
+    css_dir = posixpath.dirname(css_name)
+
+    def replace(match: "re.Match[str]") -> str:
+        url = match.group(2)
+        if not url.startswith(("http://", "https://")):
+            return match.group(0)
+        filename = (
+            hashlib.sha256(url.encode()).hexdigest()[:16]
+            + posixpath.splitext(url.split("?")[0])[1]
+        )
+        _write(os.path.join(static_dir, css_dir, filename), _download(url))
+        return f"url({filename})"
+
+    return _URL_RE.sub(replace, css)
+
+
+def used_icon_classes(paths: Iterable[str]) -> Set[str]:
+    """Every ``fa-*`` class mentioned in the given template/script files."""
+    used: Set[str] = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            used.update(_ICON_RE.findall(f.read()))
+    return used
+
+
+def _string_end(css: str, start: int) -> int:
+    """Index of the quote closing the string that opens at ``start``."""
+    quote = css[start]
+    i = start + 1
+    while i < len(css):
+        if css[i] == "\\":
+            i += 2
+            continue
+        if css[i] == quote:
+            return i
+        i += 1
+    return len(css) - 1
+
+
+def _split_rules(css: str) -> List[str]:
+    """Split a stylesheet into top-level rules and at-rule blocks."""
+    rules = []
+    i = 0
+    n = len(css)
+    while i < n:
+        start = i
+        depth = 0
+        while i < n:
+            ch = css[i]
+            if ch in "\"'":
+                i = _string_end(css, i)
+            elif css.startswith("/*", i):
+                end = css.find("*/", i + 2)
+                i = n - 1 if end < 0 else end + 1
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    i += 1
+                    break
+            elif ch == ";" and depth == 0:
+                # @charset/@import statements
+                i += 1
+                break
+            i += 1
+        rules.append(css[start:i])
+    return [rule for rule in rules if rule.strip()]
+
+
+def prune_icon_rules(css: str, keep: Set[str]) -> str:
+    """Drop ``.fa-name:before``-style selectors for icons not in ``keep``.
+
+    Only selectors that consist of a single ``fa-*`` class (optionally with
+    ``:before``/``:after``) are considered; everything else is left alone.
+    """
+    out = []
+    for rule in _split_rules(css):
+        stripped = rule.strip()
+        if stripped.startswith("@") or "{" not in stripped:
+            out.append(stripped)
+            continue
+        selectors, body = stripped.split("{", 1)
+        kept = []
+        for selector in selectors.split(","):
+            match = _ICON_SELECTOR_RE.match(selector.strip())
+            if match is None or match.group(1) in keep:
+                kept.append(selector.strip())
+        if kept:
+            out.append(",".join(kept) + "{" + body)
+    return "".join(out)
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    # ":" is left alone: "a :hover" and "a:hover" are different selectors
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _hashed_name(name: str, data: bytes) -> str:
+    root, ext = posixpath.splitext(name)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def _rewrite_urls(css: str, css_name: str, manifest: Dict[str, str]) -> str:
+    # Hashing only renames files, so the hashed CSS sits in the same directory
+    base = posixpath.dirname(css_name)
+
+    def replace(match: "re.Match[str]") -> str:
+        url = match.group(2)
+        if url.startswith(("data:", "http://", "https://", "/", "#")):
+            return match.group(0)
+        path, sep, suffix = url.partition("?")
+        if not sep:
+            path, sep, suffix = url.partition("#")
+        target = posixpath.normpath(posixpath.join(base, path))
+        if target not in manifest:
+            return match.group(0)
+        rel = posixpath.relpath(manifest[target], base or ".")
+        return f"url({rel}{sep}{suffix})"
+
+    return _URL_RE.sub(replace, css)
+
+
+def _write_variants(path: str, data: bytes) -> None:
+    if not path.endswith(COMPRESSIBLE) or len(data) < MIN_COMPRESS_BYTES:
+        return
+    _write(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write(path + ".br", brotli.compress(data, quality=11))
+
+
+def build(
+    static_dir: str = STATIC_DIR, icon_sources: Optional[Iterable[str]] = None
+) -> Dict[str, str]:
+    """Write hashed, compressed copies of every static file to ``static/dist``."""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+
+    sources: Dict[str, bytes] = {}
+    for dirpath, dirnames, filenames in os.walk(static_dir):
+        dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != dist_dir]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, static_dir).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                sources[name] = f.read()
+
+    if ICON_STYLESHEET in sources:
+        if icon_sources is None:
+            icon_sources = _default_icon_sources(static_dir)
+        keep = used_icon_classes(icon_sources)
+        css = sources[ICON_STYLESHEET].decode("utf-8")
+        sources[ICON_STYLESHEET] = prune_icon_rules(css, keep).encode("utf-8")
+
+    manifest: Dict[str, str] = {}
+    # Non-CSS first so stylesheets can point at the hashed fonts and images
+    stylesheets = sorted(name for name in sources if name.endswith(".css"))
+    for name in sorted(set(sources) - set(stylesheets)):
+        manifest[name] = _hashed_name(name, sources[name])
+        _emit(dist_dir, manifest[name], sources[name])
+    for name in stylesheets:
+        css = sources[name].decode("utf-8")
+        if not name.startswith(VENDOR_DIR + "/"):
+            css = minify_css(css)
+        # Hash after rewriting so a changed font also changes the CSS name
+        css = _rewrite_urls(css, name, manifest)
+        data = css.encode("utf-8")
+        manifest[name] = _hashed_name(name, data)
+        _emit(dist_dir, manifest[name], data)
+
+    _write(
+        os.path.join(dist_dir, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    return manifest
+
+
+def _emit(dist_dir: str, name: str, data: bytes) -> None:
+    path = os.path.join(dist_dir, name)
+    _write(path, data)
+    _write_variants(path, data)
+
+
+def _default_icon_sources(static_dir: str) -> List[str]:
+    paths = []
+    templates_dir = os.path.join(ROOT_DIR, "templates")
+    for directory, suffix in [
+        (templates_dir, ".html"),
+        (os.path.join(static_dir, "js"), ".js"),
+        (os.path.join(static_dir, "css"), ".css"),
+    ]:
+        if os.path.isdir(directory):
+            paths.extend(
+                os.path.join(directory, f)
+                for f in sorted(os.listdir(directory))
+                if f.endswith(suffix)
+            )
+    return paths
+
+
+class Assets:
+    """Resolves logical asset names to hashed URLs and serves the build."""
+
+    def __init__(self, static_dir: str = STATIC_DIR) -> None:
+        self.static_dir = static_dir
+        self.dist_dir = os.path.join(static_dir, DIST_DIR)
+        self.manifest: Dict[str, str] = {}
+        self.reload()
+
+    def reload(self) -> None:
+        try:
+            with open(os.path.join(self.dist_dir, MANIFEST_NAME)) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    @property
+    def built(self) -> bool:
+        return bool(self.manifest)
+
+    def url(self, name: str) -> str:
+        hashed = self.manifest.get(name)
+        if hashed is not None:
+            return url_for("assets", filename=hashed)
+        if name in VENDOR_ASSETS and not os.path.exists(
+            os.path.join(self.static_dir, name)
+        ):
+            return VENDOR_ASSETS[name]
+        return url_for("static", filename=name)
+
+    def serve(self, filename: str):
+        path = os.path.join(self.dist_dir, filename)
+        if not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        served, encoding = filename, None
+        accepted = request.accept_encodings
+        for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if accepted[candidate] and os.path.isfile(path + suffix):
+                served, encoding = filename + suffix, candidate
+                break
+        response = send_from_directory(
+            self.dist_dir, served, mimetype=mimetype, max_age=31536000
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if filename.endswith(COMPRESSIBLE):
+            response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    def init_app(self, app: Flask) -> None:
+        app.add_url_rule("/assets/<path:filename>", "assets", self.serve)
+        app.jinja_env.globals["asset_url"] = self.url
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--offline", action="store_true", help="don't download vendor files"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="re-download vendor files"
+    )
+    args = parser.parse_args(argv)
+    if not args.offline:
+        for name in fetch_vendor(force=args.refresh):
+            print(f"fetched {name}")
+    manifest = build()
+    total = 0
+    for name in manifest.values():
+        total += os.path.getsize(os.path.join(STATIC_DIR, DIST_DIR, name))
+    print(f"built {len(manifest)} assets ({total / 1024:.1f} KiB) into static/dist")
+    if brotli is None:
+        print("brotli is not installed; only gzip variants were written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
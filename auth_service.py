@@ -1,41 +1,17 @@
 import sqlite3
 from datetime import datetime
 from typing import Optional
-import hashlib
-import os
-import base64
-import hmac
 
-try:
-    from werkzeug.security import generate_password_hash, check_password_hash  # type: ignore
-except Exception:  # pragma: no cover - fallback if werkzeug is unavailable
+import db
+import metrics
+from password_hasher import PasswordHasher
 
-    def _pbkdf2_hash(password: str, salt: bytes, iterations: int = 260000) -> str:
-        dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-        return base64.b64encode(dk).decode("ascii")
-
-    def generate_password_hash(password: str) -> str:
-        iterations = 260000
-        salt = os.urandom(16)
-        salt_b64 = base64.b64encode(salt).decode("ascii")
-        h = _pbkdf2_hash(password, salt, iterations)
-        return f"pbkdf2:sha256:{iterations}${salt_b64}${h}"
-
-    def check_password_hash(pwhash: str, password: str) -> bool:
-        try:
-            prefix, rest = pwhash.split(":sha256:")
-            iterations_s, tail = rest.split("$", 1)
-            salt_b64, stored = tail.split("$", 1)
-            iterations = int(iterations_s)
-            salt = base64.b64decode(salt_b64)
-            calc = _pbkdf2_hash(password, salt, iterations)
-            return hmac.compare_digest(calc, stored)
-        except Exception:
-            return False
+# Used when callers don't pass their own (pooled) hasher
+DEFAULT_HASHER = PasswordHasher(max_workers=0)
 
 
 def init_db(db_path: str) -> None:
-    with sqlite3.connect(db_path) as conn:
+    with db.connect(db_path) as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS users (
@@ -51,8 +27,7 @@ def init_db(db_path: str) -> None:
 
 
 def get_user_by_email(db_path: str, email: str) -> Optional[sqlite3.Row]:
-    with sqlite3.connect(db_path) as conn:
-        conn.row_factory = sqlite3.Row
+    with metrics.stage("auth_db"), db.connect(db_path) as conn:
         cur = conn.execute(
             "SELECT id, name, email, password_hash, created_at FROM users WHERE email = ?",
             (email,),
@@ -60,18 +35,51 @@ def get_user_by_email(db_path: str, email: str) -> Optional[sqlite3.Row]:
         return cur.fetchone()
 
 
-def authenticate_user(db_path: str, email: str, password: str) -> bool:
+def verify_user(
+    db_path: str, email: str, password: str, hasher: Optional[PasswordHasher] = None
+) -> Optional[sqlite3.Row]:
+    """Return the user row if the password matches, else None.
+
+    A hash made with an outdated method or cost is replaced on success.
+    May raise ``password_hasher.PasswordHashError`` when the hasher is busy.
+    """
+    hasher = hasher or DEFAULT_HASHER
     row = get_user_by_email(db_path, email)
     if not row:
-        return False
-    return check_password_hash(row["password_hash"], password)
+        return None
+    with metrics.stage("password_hash"):
+        if not hasher.verify(row["password_hash"], password):
+            return None
+    if hasher.needs_rehash(row["password_hash"]):
+        with metrics.stage("password_hash"):
+            new_hash = hasher.hash(password)
+        with metrics.stage("auth_db"), db.connect(db_path) as conn:
+            conn.execute(
+                "UPDATE users SET password_hash = ? WHERE id = ?",
+                (new_hash, row["id"]),
+            )
+            conn.commit()
+    return row
+
+
+def authenticate_user(
+    db_path: str, email: str, password: str, hasher: Optional[PasswordHasher] = None
+) -> bool:
+    return verify_user(db_path, email, password, hasher) is not None
 
 
-def create_user(db_path: str, name: str, email: str, password: str) -> bool:
-    password_hash = generate_password_hash(password)
+def create_user(
+    db_path: str,
+    name: str,
+    email: str,
+    password: str,
+    hasher: Optional[PasswordHasher] = None,
+) -> bool:
+    with metrics.stage("password_hash"):
+        password_hash = (hasher or DEFAULT_HASHER).hash(password)
     created_at = datetime.utcnow().isoformat()
     try:
-        with sqlite3.connect(db_path) as conn:
+        with metrics.stage("auth_db"), db.connect(db_path) as conn:
             conn.execute(
                 "INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
                 (name, email, password_hash, created_at),
@@ -0,0 +1,88 @@
+"""Connection-per-call SQLite access vs the pooled WAL connections in db.py."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import auth_service
+import db
+from benchmarks.harness import format_seconds, measure, print_table
+
+
+def legacy_get_user_by_email(db_path: str, email: str):
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return conn.execute(
+            "SELECT id, name, email, password_hash, created_at FROM users WHERE email = ?",
+            (email,),
+        ).fetchone()
+
+
+def legacy_insert(db_path: str, i: int) -> None:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
+            (f"u{i}", f"legacy{i}@example.com", "x", "now"),
+        )
+
+
+def pooled_insert(db_path: str, i: int) -> None:
+    with db.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO users (name, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
+            (f"u{i}", f"pooled{i}@example.com", "x", "now"),
+        )
+
+
+def concurrent_writes(fn, db_path: str, threads: int = 8, per_thread: int = 50):
+    errors = []
+
+    def worker(t: int) -> None:
+        for j in range(per_thread):
+            try:
+                fn(db_path, t * per_thread + j)
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, len(errors)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        auth_service.init_db(path)
+        for i in range(1000):
+            pooled_insert(path, 100000 + i)
+
+        email = "pooled100500@example.com"
+        legacy = measure(lambda: legacy_get_user_by_email(path, email))["best"]
+        pooled = measure(lambda: auth_service.get_user_by_email(path, email))["best"]
+
+        legacy_w, legacy_err = concurrent_writes(legacy_insert, path)
+        pooled_w, pooled_err = concurrent_writes(pooled_insert, path)
+
+        print_table(
+            "auth DB access: connect-per-call vs pooled WAL",
+            ["case", "connect per call", "pooled"],
+            [
+                ["get_user_by_email", format_seconds(legacy), format_seconds(pooled)],
+                [
+                    "400 inserts from 8 threads",
+                    f"{format_seconds(legacy_w)} ({legacy_err} errors)",
+                    f"{format_seconds(pooled_w)} ({pooled_err} errors)",
+                ],
+            ],
+        )
+        db.close_all()
+
+
+if __name__ == "__main__":
+    main()
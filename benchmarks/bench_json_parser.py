@@ -0,0 +1,125 @@
+"""Compare the incremental JSON parser with the previous safe_json_from_text.
+
+Covers a typical recipe, a large recipe (hundreds of ingredients/steps) and
+the malformed outputs we see from the model in production.
+"""
+
+import json
+import re
+from typing import Any, Dict
+
+import json_stream
+from benchmarks.harness import format_seconds, measure, print_table
+
+
+def legacy_safe_json_from_text(text: str) -> Dict[str, Any]:
+    """The regex + slice + json.loads implementation the parser replaced."""
+    fence = re.compile(r"^\s*```(?:json)?\s*(.*)\s*```\s*$", re.DOTALL)
+    m = fence.match(text)
+    if m:
+        text = m.group(1)
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        text = text[start : end + 1]
+    return json.loads(text)
+
+
+def make_recipe(n_ingredients: int, n_steps: int) -> Dict[str, Any]:
+    return {
+        "title": "Benchmark Stew",
+        "summary": "A hearty stew used for benchmarking. " * 3,
+        "servings": 4,
+        "estimated_time_minutes": 90,
+        "cuisine": "Test",
+        "ingredients": [
+            {
+                "name": f"ingredient {i}",
+                "quantity": str(i % 7 + 1),
+                "unit": "cup",
+                "note": "finely chopped",
+            }
+            for i in range(n_ingredients)
+        ],
+        "steps": [
+            f"Step {i}: stir gently and simmer for a few minutes."
+            for i in range(n_steps)
+        ],
+        "nutrition": {"calories": 420, "protein_grams": 21.5},
+        "tips": ["Serve hot.", "Keeps for three days."],
+    }
+
+
+def payloads() -> Dict[str, str]:
+    small = json.dumps(make_recipe(10, 8))
+    large = json.dumps(make_recipe(400, 300))
+    return {
+        "small": small,
+        "small fenced": "```json\n" + small + "\n```",
+        "large": large,
+        "large truncated": large[: int(len(large) * 0.8)],
+        "trailing commas": small.replace('"}', '",}').replace("]", ",]"),
+        "unclosed string": small[: small.index("Step 3") + 4],
+        "chatter after": "Here you go: " + small + " Hope you like it! {:)}",
+    }
+
+
+def try_parse(fn, text: str) -> str:
+    try:
+        fn(text)
+        return "ok"
+    except ValueError:
+        return "FAIL"
+
+
+def incremental(text: str) -> Dict[str, Any]:
+    return json_stream.parse_json_object(text)[0]
+
+
+def incremental_chunked(text: str, size: int = 64) -> Dict[str, Any]:
+    parser = json_stream.IncrementalJSONParser()
+    for i in range(0, len(text), size):
+        parser.feed(text[i : i + size])
+    return parser.finish()
+
+
+def main() -> None:
+    rows = []
+    for name, text in payloads().items():
+        legacy_status = try_parse(legacy_safe_json_from_text, text)
+        legacy_time = (
+            format_seconds(measure(lambda: legacy_safe_json_from_text(text))["best"])
+            if legacy_status == "ok"
+            else "-"
+        )
+        parser_status = try_parse(incremental, text)
+        whole = measure(lambda: incremental(text))["best"]
+        chunked = measure(lambda: incremental_chunked(text))["best"]
+        rows.append(
+            [
+                name,
+                f"{len(text) / 1024:.1f} KiB",
+                legacy_status,
+                legacy_time,
+                parser_status,
+                format_seconds(whole),
+                format_seconds(chunked),
+            ]
+        )
+    print_table(
+        "safe_json_from_text (legacy) vs IncrementalJSONParser",
+        [
+            "payload",
+            "size",
+            "legacy",
+            "legacy time",
+            "parser",
+            "parser (whole)",
+            "parser (64B chunks)",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
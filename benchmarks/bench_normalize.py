@@ -0,0 +1,86 @@
+"""Compare normalizer.normalize_name with the previous three-regex version.
+
+Also verifies that both produce identical output on the benchmark corpus.
+"""
+
+import random
+import re
+
+import normalizer
+import recipe_service
+from benchmarks.harness import format_seconds, measure, print_table
+
+SAMPLES = [
+    "  Garlic cloves.  ",
+    "Tomatoes (ripe, diced)",
+    "Extra-virgin olive oil",
+    "Crème fraîche",
+    "Fresh basil leaves!!",
+    "1/2 cup [packed] brown sugar",
+    "Salt & pepper",
+    "Green onions",
+]
+
+
+def legacy_normalize_name(name: str) -> str:
+    s = name.lower().strip()
+    s = re.sub(r"[()\[\]{}]", " ", s)
+    s = re.sub(r"[^a-z0-9\s\-]", "", s)
+    s = re.sub(r"\s+", " ", s)
+    if s.endswith("s") and len(s) > 2:
+        s = s[:-1]
+    return s.strip()
+
+
+def legacy_parse(raw: str):
+    return [n for n in (legacy_normalize_name(p) for p in re.split(r"[\n,]", raw)) if n]
+
+
+def main() -> None:
+    rnd = random.Random(7)
+    corpus = [rnd.choice(SAMPLES) + f" {rnd.randint(0, 50)}" for _ in range(2000)]
+    assert [legacy_normalize_name(n) for n in corpus] == normalizer.normalize_many(
+        corpus
+    )
+
+    name = SAMPLES[1]
+    rows = [
+        [
+            "single name",
+            format_seconds(measure(lambda: legacy_normalize_name(name))["best"]),
+            format_seconds(measure(lambda: normalizer._normalize(name))["best"]),
+            format_seconds(measure(lambda: normalizer.normalize_name(name))["best"]),
+        ],
+        [
+            "batch of 2000 (51x repeats)",
+            format_seconds(
+                measure(lambda: [legacy_normalize_name(n) for n in corpus])["best"]
+            ),
+            format_seconds(
+                measure(lambda: [normalizer._normalize(n) for n in corpus])["best"]
+            ),
+            format_seconds(measure(lambda: normalizer.normalize_many(corpus))["best"]),
+        ],
+    ]
+    raw = ", ".join(corpus[:300])
+    normalizer.normalize_name.cache_clear()
+    rows.append(
+        [
+            "parse_available_ingredients (300)",
+            format_seconds(measure(lambda: legacy_parse(raw))["best"]),
+            "-",
+            format_seconds(
+                measure(lambda: recipe_service.parse_available_ingredients(raw))["best"]
+            ),
+        ]
+    )
+    print_table(
+        "normalize_name: legacy regex vs translate table",
+        ["case", "legacy", "single pass", "single pass + memo"],
+        rows,
+    )
+    print("\nOutput identical to the legacy implementation on the corpus.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compare PantryIndex with the previous nested-loop shopping-list diff."""
+
+import random
+from typing import Any, Dict, List, Tuple
+
+import recipe_service
+from benchmarks.harness import format_seconds, measure, print_table
+from pantry_index import PantryIndex
+
+WORDS = [
+    "tomato", "onion", "garlic", "basil", "rice", "bean", "pepper", "carrot",
+    "celery", "butter", "flour", "sugar", "milk", "egg", "lemon", "lime",
+    "ginger", "chili", "cumin", "thyme", "oregano", "pork", "beef", "chicken",
+]  # fmt: skip
+
+
+def legacy_diff(
+    recipe_ingredients: List[Dict[str, Any]], available: List[str]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """The O(recipe x pantry) loop PantryIndex replaced."""
+    have = set(str(item) for item in available if item)
+    shopping, have_items = [], []
+    for item in recipe_ingredients:
+        name = recipe_service.normalize_name(item.get("name", ""))
+        matched = False
+        for have_name in have:
+            if name == have_name or name in have_name or have_name in name:
+                matched = True
+                break
+        (have_items if matched else shopping).append(item)
+    return shopping, have_items
+
+
+def make_names(rnd: random.Random, n: int) -> List[str]:
+    return [
+        f"{rnd.choice(WORDS)} {rnd.choice(WORDS)}{rnd.randint(0, 999)}"
+        for _ in range(n)
+    ]
+
+
+def main() -> None:
+    rnd = random.Random(42)
+    recipes = [[{"name": name} for name in make_names(rnd, 15)] for _ in range(200)]
+    rows = []
+    for pantry_size in (10, 100, 500):
+        pantry = [
+            recipe_service.normalize_name(n) for n in make_names(rnd, pantry_size)
+        ]
+        recipe = recipes[0]
+        assert legacy_diff(recipe, pantry) == recipe_service.diff_shopping_list(
+            recipe, pantry, index=PantryIndex(pantry, aliases={})
+        )
+
+        legacy = measure(lambda: legacy_diff(recipe, pantry))["best"]
+        build = measure(lambda: PantryIndex(pantry))["best"]
+        index = PantryIndex(pantry)
+        lookup = measure(
+            lambda: recipe_service.diff_shopping_list(recipe, pantry, index=index)
+        )["best"]
+        legacy_bulk = measure(
+            lambda: [legacy_diff(r, pantry) for r in recipes], repeat=3
+        )["best"]
+        indexed_bulk = measure(
+            lambda: [
+                recipe_service.diff_shopping_list(r, pantry, index=index)
+                for r in recipes
+            ],
+            repeat=3,
+        )["best"]
+        rows.append(
+            [
+                pantry_size,
+                format_seconds(legacy),
+                format_seconds(build),
+                format_seconds(lookup),
+                format_seconds(legacy_bulk),
+                format_seconds(indexed_bulk),
+            ]
+        )
+    print_table(
+        "diff_shopping_list: nested loop vs PantryIndex (15-ingredient recipes)",
+        [
+            "pantry",
+            "legacy/recipe",
+            "index build",
+            "indexed/recipe",
+            "legacy x200",
+            "indexed x200",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
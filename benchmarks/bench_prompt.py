@@ -0,0 +1,44 @@
+"""Prompt size and build time: schema in the prompt vs response_schema only."""
+
+import recipe_service
+from benchmarks.harness import format_seconds, measure, print_table
+
+QUERY = "Quick weeknight pasta with garlic and basil"
+
+
+def main() -> None:
+    rows = []
+    for pantry_size in (5, 50, 500):
+        pantry = ["garlic", "basil"] + [f"pantry item {i}" for i in range(pantry_size)]
+        for label, kwargs in [
+            ("schema in prompt", {}),
+            ("no schema", {"include_schema": False}),
+            ("no schema, 4000 chars", {"include_schema": False, "max_chars": 4000}),
+        ]:
+            _prompt, stats = recipe_service.build_prompt_with_stats(
+                QUERY, pantry, "2", "italian", "30 minutes", **kwargs
+            )
+            timing = measure(
+                lambda: recipe_service.build_prompt(
+                    QUERY, pantry, "2", "italian", "30 minutes", **kwargs
+                )
+            )
+            rows.append(
+                [
+                    pantry_size + 2,
+                    label,
+                    stats["chars"],
+                    stats["approx_tokens"],
+                    stats["pantry_dropped"],
+                    format_seconds(timing["best"]),
+                ]
+            )
+    print_table(
+        "build_prompt",
+        ["pantry", "mode", "chars", "~tokens", "dropped", "build"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
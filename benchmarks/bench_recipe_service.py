@@ -0,0 +1,122 @@
+"""Micro-benchmarks for the recipe_service hot paths at scaled input sizes.
+
+    python -m benchmarks.bench_recipe_service              # compare to baseline
+    python -m benchmarks.bench_recipe_service --save-baseline
+
+Exits with status 1 if any case is slower than the stored baseline by more
+than ``--tolerance``.
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import Callable, Dict, List, Tuple
+
+import normalizer
+import recipe_service
+from benchmarks.fake_gemini import RECIPE
+from benchmarks.harness import (
+    compare_baseline,
+    format_seconds,
+    measure,
+    print_table,
+    save_baseline,
+)
+
+BASELINE = "recipe_service"
+SIZES = (10, 100, 1000)
+WORDS = [
+    "Garlic cloves",
+    "Tomatoes (ripe, diced)",
+    "Extra-virgin olive oil",
+    "Crème fraîche",
+    "Fresh basil leaves",
+    "Brown sugar",
+    "Green onions",
+    "Smoked paprika",
+]
+
+
+def pantry_names(size: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    return [f"{rnd.choice(WORDS)} {i}" for i in range(size)]
+
+
+def recipe_reply(size: int) -> str:
+    recipe = dict(RECIPE)
+    recipe["ingredients"] = [
+        {"name": name, "quantity": "1"} for name in pantry_names(size, seed=11)
+    ]
+    return "Here is your recipe:\n```json\n" + json.dumps(recipe) + "\n```"
+
+
+def cases(size: int) -> List[Tuple[str, Callable[[], object]]]:
+    names = pantry_names(size)
+    raw = ", ".join(names)
+    available = recipe_service.parse_available_ingredients(raw)
+    ingredients = [
+        {"name": name, "quantity": "1"} for name in pantry_names(size, seed=11)
+    ]
+    reply = recipe_reply(size)
+
+    def normalize_all() -> None:
+        # Cold cache each round so the memo doesn't hide the real cost
+        normalizer.normalize_name.cache_clear()
+        for name in names:
+            recipe_service.normalize_name(name)
+
+    return [
+        ("normalize_name", normalize_all),
+        (
+            "parse_available_ingredients",
+            lambda: recipe_service.parse_available_ingredients(raw),
+        ),
+        (
+            "diff_shopping_list",
+            lambda: recipe_service.diff_shopping_list(ingredients, available),
+        ),
+        ("safe_json_from_text", lambda: recipe_service.safe_json_from_text(reply)),
+        (
+            "build_prompt",
+            lambda: recipe_service.build_prompt(
+                "Quick pasta with garlic", available, "2", "italian", "30 minutes"
+            ),
+        ),
+    ]
+
+
+def run() -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    rows = []
+    for size in SIZES:
+        for name, fn in cases(size):
+            timing = measure(fn)
+            results[f"{name}[{size}]"] = timing["best"]
+            rows.append(
+                [
+                    name,
+                    size,
+                    format_seconds(timing["best"]),
+                    format_seconds(timing["median"]),
+                ]
+            )
+    print_table("recipe_service", ["function", "items", "best", "median"], rows)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    results = run()
+    if args.save_baseline:
+        print(f"\nSaved baseline to {save_baseline(BASELINE, results)}")
+        return 0
+    return 1 if compare_baseline(BASELINE, results, args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
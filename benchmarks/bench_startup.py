@@ -0,0 +1,76 @@
+"""Cold start of the app in a fresh interpreter, with its phase breakdown.
+
+Compares the default lazy Gemini import with importing the SDK up front,
+and a cold template bytecode cache with a warm one.
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import print_table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = "import app, json; print(json.dumps(app.STARTUP.report()))"
+EAGER_SCRIPT = "import google.generativeai; " + SCRIPT
+RUNS = 5
+
+
+def cold_start(script: str, env: dict) -> tuple:
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return time.perf_counter() - start, json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    base_env = {**os.environ, "MODEL_WARMUP": "off"}
+    base_env.pop("GOOGLE_API_KEY", None)
+    jinja_cache = os.path.join(ROOT, "instance", "jinja_cache")
+    rows = []
+    phases = {}
+    for label, script, clear_cache in [
+        ("lazy SDK, cold template cache", SCRIPT, True),
+        ("lazy SDK, warm template cache", SCRIPT, False),
+        ("SDK imported up front", EAGER_SCRIPT, False),
+    ]:
+        wall = []
+        for _ in range(RUNS):
+            if clear_cache:
+                shutil.rmtree(jinja_cache, ignore_errors=True)
+            seconds, report = cold_start(script, base_env)
+            wall.append(seconds)
+        phases[label] = report["phases_ms"]
+        rows.append(
+            [
+                label,
+                f"{statistics.median(wall) * 1000:.0f} ms",
+                f"{min(wall) * 1000:.0f} ms",
+                f"{report['total_ms']:.0f} ms",
+            ]
+        )
+    print_table(
+        f"Process start to app ready ({RUNS} runs each)",
+        ["mode", "wall median", "wall best", "in-app total (last run)"],
+        rows,
+    )
+    names = sorted({name for p in phases.values() for name in p})
+    print_table(
+        "Phase breakdown (last run, ms)",
+        ["phase"] + list(phases),
+        [[name] + [p.get(name, "-") for p in phases.values()] for name in names],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""An offline stand-in for ``google.generativeai`` used by the load test.
+
+``FakeGenAI`` has the two things the app uses, ``configure()`` and
+``GenerativeModel``. Each ``generate_content`` call sleeps for ``latency``
+plus up to ``jitter`` seconds, fails with probability ``failure_rate`` and
+otherwise replies with a fixed recipe (as a single response or, with
+``stream=True``, in small chunks). Install it with::
+
+    recipe_service.genai = FakeGenAI(latency=0.2, jitter=0.1)
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator
+
+RECIPE: Dict[str, Any] = {
+    "title": "Garlic Tomato Pasta",
+    "summary": "A quick weeknight pasta.",
+    "servings": 2,
+    "estimated_time_minutes": 25,
+    "cuisine": "italian",
+    "ingredients": [
+        {"name": "spaghetti", "quantity": "200 g"},
+        {"name": "tomatoes", "quantity": "4"},
+        {"name": "garlic", "quantity": "3 cloves"},
+        {"name": "olive oil", "quantity": "2 tbsp"},
+        {"name": "basil", "quantity": "1 handful"},
+        {"name": "parmesan", "quantity": "30 g"},
+    ],
+    "steps": [
+        "Boil the pasta in salted water.",
+        "Soften the garlic in olive oil, add the tomatoes and simmer.",
+        "Toss the pasta with the sauce, basil and parmesan.",
+    ],
+}
+
+
+class FakeBackendError(RuntimeError):
+    pass
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeGenAI:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        chunk_size: int = 64,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.chunk_size = chunk_size
+        self.reply = json.dumps(RECIPE)
+        self.calls = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        backend = self
+
+        class GenerativeModel:
+            def __init__(self, model_name: str = "fake", **_kwargs: Any) -> None:
+                self.model_name = model_name
+
+            def generate_content(self, prompt: str, stream: bool = False, **_kw):
+                return backend._generate(stream)
+
+        self.GenerativeModel = GenerativeModel
+
+    def configure(self, **_kwargs: Any) -> None:
+        pass
+
+    def _generate(self, stream: bool):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        time.sleep(delay)
+        if fail:
+            raise FakeBackendError("fake backend: simulated failure")
+        if stream:
+            return self._chunks()
+        return FakeResponse(self.reply)
+
+    def _chunks(self) -> Iterator[FakeResponse]:
+        size = self.chunk_size
+        for start in range(0, len(self.reply), size):
+            yield FakeResponse(self.reply[start : start + size])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "failures": self.failures}
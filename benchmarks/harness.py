@@ -0,0 +1,107 @@
+"""Small timing helpers shared by the benchmark scripts.
+
+Run a benchmark from the repository root, e.g.::
+
+    python -m benchmarks.bench_json_parser
+"""
+
+import json
+import math
+import os
+import statistics
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """Time ``fn`` and return per-call seconds (best and median of ``repeat``)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(runs), "median": statistics.median(runs), "calls": number}
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-6:
+        return f"{seconds * 1e9:.0f} ns"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def print_table(title: str, headers: Sequence[str], rows: List[Sequence[Any]]) -> None:
+    cells = [[str(h) for h in headers]] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    print(f"\n{title}")
+    for n, row in enumerate(cells):
+        print("  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)))
+        if n == 0:
+            print("  ".join("-" * w for w in widths))
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in 0-100) of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def load_baseline(name: str) -> Optional[Dict[str, float]]:
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(name: str, results: Dict[str, float]) -> str:
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def compare_baseline(
+    name: str,
+    results: Dict[str, float],
+    tolerance: float = 0.25,
+    higher_is_better: Sequence[str] = (),
+) -> List[str]:
+    """Print results next to the stored baseline and return the regressions.
+
+    A metric regresses when it is more than ``tolerance`` (as a fraction)
+    worse than the baseline. Metrics are lower-is-better (latencies) unless
+    listed in ``higher_is_better`` (throughput).
+    """
+    baseline = load_baseline(name)
+    if baseline is None:
+        print(f"\nNo baseline for {name}; save one with --save-baseline")
+        return []
+    regressions = []
+    rows = []
+    for metric, value in sorted(results.items()):
+        base = baseline.get(metric)
+        if not base:
+            rows.append([metric, f"{value:.6g}", "-", "-", ""])
+            continue
+        change = (value - base) / base
+        worse = -change if metric in higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(metric)
+        rows.append([metric, f"{value:.6g}", f"{base:.6g}", f"{change:+.1%}", flag])
+    print_table(
+        f"{name} vs baseline (tolerance {tolerance:.0%})",
+        ["metric", "now", "baseline", "change", ""],
+        rows,
+    )
+    return regressions
@@ -0,0 +1,236 @@
+"""End-to-end load test of /login and /generate against a fake Gemini backend.
+
+Starts the app on a threaded local server with a throwaway instance
+directory, registers ``--users`` accounts, then has each user sign in and
+submit ``--requests`` generations concurrently. The model is replaced with
+``benchmarks.fake_gemini.FakeGenAI`` so nothing leaves the machine::
+
+    python -m benchmarks.load_test --users 20 --requests 10 --latency 0.2
+    python -m benchmarks.load_test --save-baseline
+
+Reports throughput and p50/p95/p99 latency per endpoint and exits with
+status 1 on a regression against the stored baseline.
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.fake_gemini import FakeGenAI
+from benchmarks.harness import (
+    compare_baseline,
+    format_seconds,
+    percentile,
+    print_table,
+    save_baseline,
+)
+
+BASELINE = "load_test"
+PASSWORD = "load-test-password"
+
+
+class Client:
+    """One simulated user: a cookie jar over fresh loopback connections."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.cookies: Dict[str, str] = {}
+
+    def post(self, path: str, form: Dict[str, str]) -> Tuple[int, str, float]:
+        """POST ``form`` and return (status, Location, seconds) without redirects."""
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=urlencode(form), headers=headers)
+            response = conn.getresponse()
+            response.read()
+        finally:
+            conn.close()
+        elapsed = time.perf_counter() - start
+        for header in response.headers.get_all("Set-Cookie") or []:
+            name, _, rest = header.partition("=")
+            self.cookies[name.strip()] = rest.split(";", 1)[0]
+        return response.status, response.headers.get("Location", ""), elapsed
+
+
+def configure_environment(instance_path: str) -> None:
+    """Settings read by app.py at import; must run before it is imported."""
+    os.environ.update(
+        INSTANCE_PATH=instance_path,
+        GOOGLE_API_KEY=os.environ.get("GOOGLE_API_KEY") or "offline",
+        MODEL_WARMUP="off",
+        TEMPLATE_PRECOMPILE="0",
+        RATE_LIMIT_LOGIN="0",
+        RATE_LIMIT_REGISTER="0",
+        RATE_LIMIT_GENERATE="0",
+    )
+
+
+def start_server(app) -> Tuple[int, object]:
+    from werkzeug.serving import make_server
+
+    # One access-log line per request would drown the report
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.port, server
+
+
+def login(port: int, email: str) -> Tuple[Client, bool, float]:
+    client = Client(port)
+    status, location, elapsed = client.post(
+        "/login", {"email": email, "password": PASSWORD}
+    )
+    return client, status == 302 and location.endswith("/home"), elapsed
+
+
+def generate(
+    client: Client, requests: int, bypass_cache: bool
+) -> List[Tuple[bool, float]]:
+    samples = []
+    for n in range(requests):
+        form = {
+            "recipe_prompt": f"Quick pasta with garlic #{n}",
+            "available_ingredients": "garlic, tomatoes, olive oil, salt",
+            "servings": "2",
+            "cuisine": "italian",
+            "time_pref": "30 minutes",
+        }
+        if bypass_cache:
+            form["bypass_cache"] = "1"
+        status, _location, elapsed = client.post("/generate", form)
+        # Failures flash and redirect back to the form
+        samples.append((status == 200, elapsed))
+    return samples
+
+
+def summarize(
+    endpoint: str, samples: List[Tuple[bool, float]], wall: float
+) -> Tuple[List[object], Dict[str, float]]:
+    ok = [seconds for success, seconds in samples if success]
+    errors = len(samples) - len(ok)
+    metrics = {
+        f"{endpoint}.throughput_rps": len(ok) / wall if wall else 0.0,
+        f"{endpoint}.p50_s": percentile(ok, 50),
+        f"{endpoint}.p95_s": percentile(ok, 95),
+        f"{endpoint}.p99_s": percentile(ok, 99),
+        f"{endpoint}.error_rate": errors / len(samples) if samples else 0.0,
+    }
+    row = [
+        endpoint,
+        len(samples),
+        errors,
+        f"{metrics[f'{endpoint}.throughput_rps']:.1f}",
+        *(format_seconds(metrics[f"{endpoint}.p{p}_s"]) for p in (50, 95, 99)),
+    ]
+    return row, metrics
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory(prefix="load-test-") as tmp:
+        configure_environment(tmp)
+        import app as appmod
+        import recipe_service
+
+        backend = FakeGenAI(
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        )
+        recipe_service.genai = backend
+        recipe_service.MODEL_REGISTRY.clear()
+
+        emails = [f"user{i}@load.test" for i in range(args.users)]
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            list(
+                pool.map(
+                    lambda email: appmod.create_user("Load", email, PASSWORD), emails
+                )
+            )
+
+        port, server = start_server(appmod.app)
+        # Two phases so each endpoint's throughput has its own wall clock
+        try:
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                start = time.perf_counter()
+                logins = list(pool.map(lambda email: login(port, email), emails))
+                login_wall = time.perf_counter() - start
+
+                clients = [client for client, ok, _s in logins if ok]
+                start = time.perf_counter()
+                sessions = list(
+                    pool.map(
+                        lambda client: generate(
+                            client, args.requests, not args.use_cache
+                        ),
+                        clients,
+                    )
+                )
+                generate_wall = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            appmod.PASSWORD_HASHER.shutdown()
+
+    rows = []
+    results: Dict[str, float] = {}
+    for endpoint, samples, wall in [
+        ("login", [(ok, seconds) for _c, ok, seconds in logins], login_wall),
+        ("generate", [sample for s in sessions for sample in s], generate_wall),
+    ]:
+        row, metrics = summarize(endpoint, samples, wall)
+        rows.append(row)
+        results.update(metrics)
+    print_table(
+        f"load test: {args.users} users x {args.requests} generations,"
+        f" model latency {args.latency}s +{args.jitter}s,"
+        f" failure rate {args.failure_rate:.0%}",
+        ["endpoint", "requests", "errors", "req/s", "p50", "p95", "p99"],
+        rows,
+    )
+    print(f"\nFake backend: {backend.stats()}")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=5, help="per user")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--use-cache", action="store_true", help="let repeat prompts hit the cache"
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.save_baseline:
+        print(f"\nSaved baseline to {save_baseline(BASELINE, results)}")
+        return 0
+    regressions = compare_baseline(
+        BASELINE,
+        # Error rates follow --failure-rate, not the code under test
+        {k: v for k, v in results.items() if not k.endswith("error_rate")},
+        args.tolerance,
+        higher_is_better=[k for k in results if k.endswith("throughput_rps")],
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import db
+
+
+class RecipeCache:
+    """Two-tier recipe cache: in-memory LRU in front of a SQLite table.
+
+    Entries expire after ``ttl_seconds``. The memory tier holds at most
+    ``max_entries`` recipes; the SQLite tier is pruned to ``max_rows``.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = 256,
+        ttl_seconds: float = 24 * 3600,
+        max_rows: int = 10000,
+    ) -> None:
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        # key -> (created_at, serialized recipe); stored as JSON so callers can't
+        # mutate cached entries.
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "writes": 0,
+        }
+        self.init_db()
+
+    def init_db(self) -> None:
+        with db.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS recipe_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_recipe_cache_created_at ON recipe_cache (created_at)"
+            )
+            conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, payload: str) -> None:
+        # Caller holds the lock.
+        self._memory[key] = (created_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, payload = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return json.loads(payload)
+                del self._memory[key]
+                self._stats["expirations"] += 1
+
+        with db.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM recipe_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1], now):
+                conn.execute("DELETE FROM recipe_cache WHERE key = ?", (key,))
+                conn.commit()
+                row = None
+                with self._lock:
+                    self._stats["expirations"] += 1
+
+        with self._lock:
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._remember(key, row[1], row[0])
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        created_at = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._remember(key, created_at, payload)
+            self._stats["writes"] += 1
+        with db.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO recipe_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, payload, created_at),
+            )
+            cur = conn.execute(
+                """
+                DELETE FROM recipe_cache WHERE key IN (
+                    SELECT key FROM recipe_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_rows,),
+            )
+            conn.commit()
+        if cur.rowcount > 0:
+            with self._lock:
+                self._stats["evictions"] += cur.rowcount
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        with db.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM recipe_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        with db.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM recipe_cache")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] / lookups) if lookups else 0.0
+        return stats
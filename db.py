@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Applied to every pooled connection. WAL lets readers proceed while a writer
+# commits; busy_timeout makes writers wait for the lock instead of failing
+# with "database is locked".
+DEFAULT_PRAGMAS: List[Tuple[str, Any]] = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", 5000),
+    ("cache_size", -8000),  # KiB, i.e. ~8 MB page cache
+    ("mmap_size", 128 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+    ("foreign_keys", "ON"),
+]
+
+
+class ConnectionPool:
+    """Per-thread pooled connections to one SQLite database.
+
+    Each thread reuses its own connection (and its prepared-statement cache)
+    until it has been checked out ``max_uses`` times or is older than
+    ``max_age_seconds``, at which point it is closed and reopened.
+    Connections inherited across ``fork()`` are never reused.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_uses: int = 10000,
+        max_age_seconds: float = 600.0,
+        cached_statements: int = 256,
+        pragmas: Optional[List[Tuple[str, Any]]] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.max_uses = max_uses
+        self.max_age_seconds = max_age_seconds
+        self.cached_statements = cached_statements
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._connections: List[sqlite3.Connection] = []
+        self._stats = {"opened": 0, "recycled": 0, "checkouts": 0}
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,  # only the owning thread uses it; close_all may run elsewhere
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name}={value}")
+        with self._lock:
+            self._connections.append(conn)
+            self._stats["opened"] += 1
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def _reset_after_fork(self) -> None:
+        # Connections (and locks) copied from the parent must not be used.
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._pid = os.getpid()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening or recycling as needed."""
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+        local = self._local
+        conn = getattr(local, "conn", None)
+        now = time.monotonic()
+        if conn is not None and (
+            local.uses >= self.max_uses or now - local.opened_at > self.max_age_seconds
+        ):
+            self._discard(conn)
+            conn = None
+            with self._lock:
+                self._stats["recycled"] += 1
+        if conn is None:
+            conn = self._open()
+            local.conn = conn
+            local.opened_at = now
+            local.uses = 0
+        local.uses += 1
+        with self._lock:
+            self._stats["checkouts"] += 1
+        return conn
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["open_connections"] = len(self._connections)
+        stats["db_path"] = self.db_path
+        return stats
+
+    def health(self) -> Dict[str, Any]:
+        """Run a trivial query and report latency and journal mode."""
+        start = time.perf_counter()
+        try:
+            conn = self.connection()
+            conn.execute("SELECT 1").fetchone()
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        except sqlite3.Error as e:
+            return {"ok": False, "error": str(e), **self.stats()}
+        return {
+            "ok": True,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "journal_mode": journal_mode,
+            **self.stats(),
+        }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Return the process-wide pool for ``db_path``, creating it on first use."""
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(db_path)
+                _pools[key] = pool
+    return pool
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Pooled replacement for ``sqlite3.connect``.
+
+    Use as ``with connect(path) as conn:`` - the block commits or rolls back
+    but leaves the connection open for reuse.
+    """
+    return get_pool(db_path).connection()
+
+
+def close_all() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+def stats() -> List[Dict[str, Any]]:
+    return [pool.stats() for pool in list(_pools.values())]
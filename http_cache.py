@@ -0,0 +1,128 @@
+"""ETags, conditional GETs and compression for dynamic responses.
+
+``init_app`` installs an ``after_request`` hook that, for buffered
+responses, adds a strong ETag (answering a matching ``If-None-Match`` with
+304) and compresses bodies above ``min_size`` with brotli or gzip as the
+client accepts. Streamed responses (SSE), files and anything already
+encoded are left untouched.
+"""
+
+import gzip
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from flask import Flask, Response, make_response, request, session
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - gzip only without the optional package
+    brotli = None  # type: ignore
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/plain",
+        "text/css",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "image/svg+xml",
+    }
+)
+
+
+def cacheable(max_age: int = 0) -> Callable:
+    """Mark a view's GET responses as storable by shared caches.
+
+    Use only for pages that render the same for every anonymous visitor.
+    With the default ``max_age=0`` caches must revalidate each time (cheap
+    with the ETag); only give a positive ``max_age`` to pages that can never
+    show a flash message. Responses that changed the session are left
+    alone, and signed-in visitors only get a private copy.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapped(*args: Any, **kwargs: Any):
+            response = make_response(view(*args, **kwargs))
+            if (
+                request.method in ("GET", "HEAD")
+                and response.status_code == 200
+                and not session.modified
+            ):
+                if session:
+                    response.cache_control.private = True
+                else:
+                    response.cache_control.public = True
+                if max_age:
+                    response.cache_control.max_age = max_age
+                else:
+                    response.cache_control.no_cache = True
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def _choose_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        # Dynamic content: a middling quality keeps CPU cost close to gzip
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def process_response(
+    response: Response, min_size: int = 1024, level: int = 6
+) -> Response:
+    if (
+        response.is_streamed
+        or response.direct_passthrough
+        or response.status_code != 200
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    data = response.get_data()
+    response.vary.add("Accept-Encoding")
+    encoding = None
+    if len(data) >= min_size and "no-transform" not in response.headers.get(
+        "Cache-Control", ""
+    ):
+        encoding = _choose_encoding()
+
+    if request.method in ("GET", "HEAD") and "ETag" not in response.headers:
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        # Each encoding is a different representation and needs its own tag
+        response.set_etag(f"{digest}-{encoding}" if encoding else digest)
+        if response.headers.get("Cache-Control") is None:
+            # Let browsers keep the page but check back each time
+            response.cache_control.no_cache = True
+            response.cache_control.private = True
+        if request.if_none_match.contains(response.get_etag()[0]):
+            response.status_code = 304
+            response.set_data(b"")
+            response.headers.pop("Content-Length", None)
+            return response
+
+    if encoding:
+        response.set_data(_compress(data, encoding, level))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app: Flask, min_size: int = 1024, level: int = 6) -> None:
+    @app.after_request
+    def _http_cache(response: Response) -> Response:
+        return process_response(response, min_size=min_size, level=level)
@@ -0,0 +1,191 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+
+FINISHED = frozenset({DONE, FAILED, CANCELLED, TIMED_OUT})
+
+
+class QueueFull(Exception):
+    """Raised by ``JobQueue.submit`` when no more jobs can be accepted."""
+
+
+class Job:
+    def __init__(
+        self, owner: Optional[str], timeout_seconds: float, context: Any = None
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        # Caller data needed to present the result (not passed to the job)
+        self.context = context
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.deadline = time.monotonic() + timeout_seconds
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Bounded background executor for slow work such as recipe generation.
+
+    At most ``max_workers`` jobs run at once and at most ``max_pending`` are
+    accepted (queued + running) before ``submit`` raises ``QueueFull``.
+    A job still unfinished after ``timeout_seconds`` is reported as timed out;
+    its worker slot is released when the underlying call returns. Finished
+    jobs are kept for ``retention_seconds`` so clients can collect results.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_pending: int = 32,
+        timeout_seconds: float = 120.0,
+        retention_seconds: float = 600.0,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="generation-job"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            DONE: 0,
+            FAILED: 0,
+            CANCELLED: 0,
+            TIMED_OUT: 0,
+        }
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        owner: Optional[str] = None,
+        context: Any = None,
+    ) -> Job:
+        """Queue ``fn(*args)``; raise ``QueueFull`` when at capacity."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise QueueFull("Too many recipe generations in progress")
+        self._prune()
+        job = Job(owner, self.timeout_seconds, context)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._stats["submitted"] += 1
+        try:
+            job.future = self._executor.submit(self._run, job, fn, args)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple) -> None:
+        try:
+            with self._lock:
+                if job.status != QUEUED:
+                    return
+                job.status = RUNNING
+                job.started_at = time.time()
+            try:
+                result = fn(*args)
+            except Exception as e:
+                self._finish(job, FAILED, error=str(e))
+            else:
+                self._finish(job, DONE, result=result)
+        finally:
+            self._slots.release()
+
+    def _finish(
+        self, job: Job, status: str, result: Any = None, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            if job.status in FINISHED:
+                # Cancelled or timed out while running; drop the late result.
+                return
+            if status == DONE and time.monotonic() > job.deadline:
+                status, error = TIMED_OUT, "Recipe generation timed out"
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            self._stats[status] += 1
+
+    def _stop(self, job: Job) -> None:
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # Never started, so _run won't release its slot
+            self._slots.release()
+
+    def _check_deadline(self, job: Job) -> None:
+        if job.status not in FINISHED and time.monotonic() > job.deadline:
+            self._stop(job)
+            self._finish(job, TIMED_OUT, error="Recipe generation timed out")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            self._check_deadline(job)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if already finished."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return False
+        self._stop(job)
+        self._finish(job, CANCELLED, error="Cancelled")
+        return True
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            stale = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in stale:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["queued"] = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+            stats["running"] = sum(
+                1 for j in self._jobs.values() if j.status == RUNNING
+            )
+        stats["max_workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
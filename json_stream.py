@@ -0,0 +1,342 @@
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Characters that end a run of ordinary string content
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+# A run of characters that can make up a number or a bare literal
+_SCALAR_RUN = re.compile(r"[^\s,:\]\}\[\{\"]+")
+_WHITESPACE_RUN = re.compile(r"[ \t\r\n]+")
+
+# Non-JSON literals models occasionally emit, mapped to their JSON equivalents
+_LITERAL_FIXES = {"True": True, "False": False, "None": None}
+
+_decoder = json.JSONDecoder(strict=False)
+
+
+class ParseEvent(NamedTuple):
+    """A value completed while parsing a streamed JSON object.
+
+    ``kind`` is ``"field"`` for a finished top-level field and ``"item"`` for
+    a finished element of a top-level array field. ``key`` is the top-level
+    field name in both cases.
+    """
+
+    kind: str
+    key: str
+    value: Any
+
+
+class _Frame:
+    __slots__ = (
+        "kind",
+        "key",
+        "key_start",
+        "value_start",
+        "scalar",
+        "expect",
+        "comma_pos",
+        "items",
+    )
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind  # "{" or "["
+        self.key: Optional[str] = None
+        self.key_start = -1
+        self.value_start = -1
+        self.scalar = False
+        self.expect = "key" if kind == "{" else "value"
+        # Position of the comma introducing the entry in progress, if any
+        self.comma_pos = -1
+        # Decoded elements, kept for top-level arrays so they aren't parsed twice
+        self.items: Optional[List[Any]] = None
+
+
+class IncrementalJSONParser:
+    """Single-pass, fault-tolerant parser for a JSON object arriving in chunks.
+
+    Text before the first ``{`` (code fences, chatter) and after the matching
+    ``}`` is ignored. ``feed`` returns the events completed by the new chunk.
+
+    Common model defects are repaired as they are found and described in
+    ``fixes``: trailing commas, missing commas between values, keys without
+    values, raw control characters in strings and Python literals. ``close``
+    additionally repairs truncated output by closing unterminated strings,
+    arrays and objects.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        # (start, stop, replacement) applied to the buffer when values are sliced
+        self._edits: List[Tuple[int, int, str]] = []
+        self.done = False
+        self.result: Dict[str, Any] = {}
+        self.fixes: List[str] = []
+        self.found_object = False
+
+    def feed(self, chunk: str) -> List[ParseEvent]:
+        self._buf += chunk
+        events: List[ParseEvent] = []
+        buf = self._buf
+        n = len(buf)
+        i = self._pos
+        stack = self._stack
+        while i < n and not self.done:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                m = _STRING_SPECIAL.search(buf, i)
+                if m is None:
+                    i = n
+                    break
+                i = m.start()
+                ch = buf[i]
+                if ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+                else:
+                    self._fix("kept raw control character inside a string")
+                i += 1
+                continue
+
+            if not stack:
+                j = buf.find("{", i)
+                if j < 0:
+                    i = n
+                    break
+                stack.append(_Frame("{"))
+                self.found_object = True
+                i = j + 1
+                continue
+
+            ch = buf[i]
+            frame = stack[-1]
+            if ch in " \t\r\n":
+                i = _WHITESPACE_RUN.match(buf, i).end()
+                continue
+            if ch == '"':
+                if frame.kind == "{" and frame.expect == "colon":
+                    self._fix("inserted missing colon")
+                    self._edits.append((i, i, ":"))
+                    frame.expect = "value"
+                if frame.kind == "{" and frame.expect != "value":
+                    if frame.expect == "comma":
+                        self._insert_comma(frame, i)
+                    frame.key_start = i
+                    frame.expect = "key"
+                else:
+                    if frame.expect == "comma":
+                        self._insert_comma(frame, i)
+                    frame.value_start = i
+                self._in_string = True
+            elif ch == "{" or ch == "[":
+                if frame.expect == "comma":
+                    self._insert_comma(frame, i)
+                frame.value_start = i
+                child = _Frame(ch)
+                if ch == "[" and len(stack) == 1:
+                    child.items = []
+                stack.append(child)
+            elif ch == "}" or ch == "]":
+                if frame.scalar:
+                    self._complete(frame, i, events)
+                elif frame.kind == "{" and frame.expect in ("colon", "value"):
+                    self._fix(f"dropped key {frame.key!r} without a value")
+                    self._drop_entry(frame, frame.key_start, i)
+                elif frame.expect != "comma" and frame.comma_pos >= 0:
+                    self._fix("removed trailing comma")
+                    self._edits.append((frame.comma_pos, frame.comma_pos + 1, ""))
+                closed = stack.pop()
+                if not stack:
+                    self.done = True
+                else:
+                    self._complete(stack[-1], i + 1, events, closed.items)
+            elif ch == ":":
+                frame.expect = "value"
+            elif ch == ",":
+                if frame.scalar:
+                    self._complete(frame, i, events)
+                frame.comma_pos = i
+                frame.expect = "key" if frame.kind == "{" else "value"
+            else:
+                # A number or a bare literal, possibly continued from the
+                # previous chunk
+                if not frame.scalar:
+                    if frame.expect == "comma":
+                        self._insert_comma(frame, i)
+                    frame.value_start = i
+                    frame.scalar = True
+                i = _SCALAR_RUN.match(buf, i).end()
+                continue
+            i += 1
+        self._pos = i
+        return events
+
+    def _fix(self, message: str) -> None:
+        if message not in self.fixes:
+            self.fixes.append(message)
+
+    def _insert_comma(self, frame: _Frame, pos: int) -> None:
+        self._fix("inserted missing comma")
+        self._edits.append((pos, pos, ","))
+        frame.comma_pos = pos
+
+    def _drop_entry(self, frame: _Frame, start: int, stop: int) -> None:
+        """Delete an incomplete entry (and the comma introducing it)."""
+        if frame.comma_pos >= 0:
+            start = frame.comma_pos
+            last = self._edits[-1] if self._edits else None
+            if last is not None and last[0] == last[1] == start:
+                # The comma was one we inserted; dropping it is enough.
+                self._edits.pop()
+        self._edits.append((start, stop, ""))
+        frame.value_start = -1
+        frame.scalar = False
+        frame.comma_pos = -1
+        frame.expect = "comma"
+
+    def _slice(self, start: int, end: int) -> str:
+        buf = self._buf
+        if not self._edits or self._edits[-1][1] <= start:
+            return buf[start:end]
+        pieces = []
+        cur = start
+        for pos, stop, text in self._edits:
+            if pos < start or stop > end or (pos == stop == start):
+                continue
+            pieces.append(buf[cur:pos])
+            pieces.append(text)
+            cur = stop
+        pieces.append(buf[cur:end])
+        return "".join(pieces)
+
+    def _loads(self, text: str) -> Any:
+        try:
+            return _decoder.decode(text)
+        except ValueError:
+            literal = text.strip()
+            if literal in _LITERAL_FIXES:
+                self._fix(f"converted literal {literal} to JSON")
+                return _LITERAL_FIXES[literal]
+            raise
+
+    def _close_string(self, end: int, events: List[ParseEvent]) -> None:
+        frame = self._stack[-1]
+        if frame.kind == "{" and frame.expect == "key":
+            frame.key = _decoder.decode(self._slice(frame.key_start, end + 1))
+            frame.expect = "colon"
+        else:
+            self._complete(frame, end + 1, events)
+
+    def _complete(
+        self,
+        frame: _Frame,
+        end: int,
+        events: List[ParseEvent],
+        items: Optional[List[Any]] = None,
+    ) -> None:
+        start = frame.value_start
+        frame.value_start = -1
+        frame.scalar = False
+        frame.comma_pos = -1
+        frame.expect = "comma"
+        depth = len(self._stack)
+        if depth == 1 and frame.key is not None:
+            if items is not None:
+                value: Any = items
+            else:
+                value = self._loads(self._slice(start, end))
+            self.result[frame.key] = value
+            events.append(ParseEvent("field", frame.key, value))
+        elif depth == 2 and frame.items is not None:
+            value = self._loads(self._slice(start, end))
+            frame.items.append(value)
+            key = self._stack[0].key
+            if key is not None:
+                events.append(ParseEvent("item", key, value))
+
+    def _repair_truncation(self) -> List[ParseEvent]:
+        """Close whatever is still open so the parsed prefix can be used."""
+        events: List[ParseEvent] = []
+        n = len(self._buf)
+        frame = self._stack[-1]
+        if self._in_string:
+            if frame.kind == "{" and frame.expect == "key":
+                self._in_string = False
+                self._escape = False
+                self._fix("dropped truncated key")
+                self._drop_entry(frame, frame.key_start, n)
+            else:
+                if self._escape:
+                    self._edits.append((n - 1, n, ""))
+                    self._escape = False
+                self._fix("closed unterminated string")
+                events.extend(self.feed('"'))
+                n = len(self._buf)
+        frame = self._stack[-1]
+        if frame.scalar:
+            text = self._slice(frame.value_start, n).strip()
+            try:
+                self._loads(text)
+            except ValueError:
+                self._fix(f"dropped truncated value {text!r}")
+                entry_start = (
+                    frame.key_start if frame.kind == "{" else frame.value_start
+                )
+                self._drop_entry(frame, entry_start, n)
+        elif frame.kind == "{" and frame.expect in ("colon", "value"):
+            self._fix(f"dropped key {frame.key!r} without a value")
+            self._drop_entry(frame, frame.key_start, n)
+        elif frame.expect != "comma" and frame.comma_pos >= 0:
+            self._fix("removed trailing comma")
+            self._edits.append((frame.comma_pos, frame.comma_pos + 1, ""))
+            frame.comma_pos = -1
+        closers = "".join("}" if f.kind == "{" else "]" for f in reversed(self._stack))
+        self._fix(f"closed {len(closers)} unterminated container(s)")
+        events.extend(self.feed(closers))
+        return events
+
+    def close(self, repair: bool = True) -> List[ParseEvent]:
+        """Signal end of input and return any events completed by repairs.
+
+        When the input ended early and ``repair`` is true, open strings and
+        containers are closed so the parsed prefix is kept; otherwise
+        ``ValueError`` is raised.
+        """
+        events: List[ParseEvent] = []
+        if not self.done and self._stack and repair:
+            events = self._repair_truncation()
+        if not self.done:
+            raise ValueError("Incomplete JSON object in model response")
+        return events
+
+    def finish(self, repair: bool = True) -> Dict[str, Any]:
+        """Close the parser and return the parsed object."""
+        self.close(repair)
+        return self.result
+
+
+def parse_json_object(text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Parse a complete model response, returning (object, fixes applied).
+
+    Well-formed responses take a fast path through the C decoder; anything it
+    rejects goes through the repairing parser.
+    """
+    start = text.find("{")
+    if start >= 0:
+        try:
+            obj, _end = _decoder.raw_decode(text, start)
+            return obj, []
+        except ValueError:
+            pass
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.finish(), parser.fixes
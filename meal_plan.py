@@ -0,0 +1,198 @@
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from normalizer import normalize_name
+from pantry_index import PantryIndex
+from recipe_service import diff_shopping_list
+
+
+def split_meal_requests(raw: str, max_meals: int) -> List[str]:
+    """One meal request per non-empty line, capped at ``max_meals``."""
+    meals = [line.strip() for line in raw.splitlines()]
+    return [meal for meal in meals if meal][:max_meals]
+
+
+def _format_amount(item: Dict[str, Any]) -> str:
+    quantity = str(item.get("quantity") or "").strip()
+    unit = str(item.get("unit") or "").strip()
+    return f"{quantity} {unit}".strip()
+
+
+def merge_shopping_lists(
+    shopping_lists: List[List[Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """Combine per-recipe shopping lists, merging items by normalized name.
+
+    Quantities are not converted between units; distinct amounts are joined
+    (e.g. "2 cup + 1 tbsp"). ``meals`` lists the indexes of the recipes that
+    need each item.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for meal_index, items in enumerate(shopping_lists):
+        for item in items:
+            name = item.get("name", "")
+            key = normalize_name(name)
+            if not key:
+                continue
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {"name": name, "amounts": [], "meals": []}
+            amount = _format_amount(item)
+            if amount:
+                entry["amounts"].append(amount)
+            if meal_index not in entry["meals"]:
+                entry["meals"].append(meal_index)
+    return [
+        {
+            "name": entry["name"],
+            "quantity": " + ".join(entry["amounts"]),
+            "meals": entry["meals"],
+        }
+        for entry in merged.values()
+    ]
+
+
+class _Call:
+    def __init__(self, meal: str) -> None:
+        self.meal = meal
+        self.started_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+
+class MealPlanner:
+    """Generate several recipes at once on a shared, bounded thread pool.
+
+    Each generation gets ``call_timeout_seconds`` from the moment it starts
+    running; a whole plan gives up on calls still queued after
+    ``plan_timeout_seconds`` (by default enough rounds of the pool to run
+    every meal once). Slow calls are abandoned, not interrupted: their
+    worker is freed when the underlying model call returns.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        call_timeout_seconds: float = 60.0,
+        plan_timeout_seconds: Optional[float] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.call_timeout_seconds = call_timeout_seconds
+        self.plan_timeout_seconds = plan_timeout_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="meal-plan"
+        )
+        self._lock = threading.Lock()
+        self._stats = {"plans": 0, "calls": 0, "failed": 0, "timed_out": 0}
+
+    def _run(self, call: _Call, generate: Callable[[str], Dict[str, Any]]) -> Any:
+        call.started_at = time.monotonic()
+        return generate(call.meal)
+
+    def _plan_timeout(self, n_meals: int) -> float:
+        if self.plan_timeout_seconds is not None:
+            return self.plan_timeout_seconds
+        rounds = math.ceil(n_meals / self.max_workers)
+        return self.call_timeout_seconds * rounds
+
+    def _collect(self, calls: List[_Call]) -> Dict[int, Any]:
+        """Wait for calls until each finishes or runs out of time.
+
+        Returns ``{index: recipe or exception}``; missing indexes timed out.
+        """
+        plan_deadline = time.monotonic() + self._plan_timeout(len(calls))
+        pending = {call.future: i for i, call in enumerate(calls)}
+        outcomes: Dict[int, Any] = {}
+        while pending:
+            now = time.monotonic()
+            deadlines = [plan_deadline]
+            for future, i in list(pending.items()):
+                started_at = calls[i].started_at
+                if started_at is None:
+                    if now >= plan_deadline:
+                        future.cancel()
+                        del pending[future]
+                    continue
+                call_deadline = started_at + self.call_timeout_seconds
+                if now >= call_deadline and not future.done():
+                    del pending[future]
+                else:
+                    deadlines.append(call_deadline)
+            if not pending:
+                break
+            timeout = max(min(deadlines) - now, 0.0)
+            # Re-check at least every 50ms so calls that start later get a deadline
+            done, _ = wait(
+                pending, timeout=min(timeout, 0.05), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                i = pending.pop(future)
+                error = future.exception() if not future.cancelled() else None
+                outcomes[i] = error if error is not None else future.result()
+        return outcomes
+
+    def plan(
+        self,
+        meals: List[str],
+        available: List[str],
+        generate: Callable[[str], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Generate a recipe per meal request and a merged shopping list.
+
+        ``generate(meal)`` must return a recipe dict and may be called from
+        worker threads. Failed or timed-out meals are reported with an
+        ``error`` and left out of the shopping list.
+        """
+        started = time.perf_counter()
+        calls = [_Call(meal) for meal in meals]
+        for call in calls:
+            call.future = self._executor.submit(self._run, call, generate)
+        outcomes = self._collect(calls)
+
+        index = PantryIndex(available)
+        results: List[Dict[str, Any]] = []
+        shopping_lists: List[List[Dict[str, Any]]] = []
+        failed = timed_out = 0
+        for i, call in enumerate(calls):
+            outcome = outcomes.get(i)
+            entry: Dict[str, Any] = {"request": call.meal, "recipe": None}
+            if outcome is None:
+                entry["error"] = "Recipe generation timed out"
+                timed_out += 1
+                shopping: List[Dict[str, Any]] = []
+            elif isinstance(outcome, BaseException):
+                entry["error"] = str(outcome)
+                failed += 1
+                shopping = []
+            else:
+                shopping, have_items = diff_shopping_list(
+                    outcome.get("ingredients", []), available, index=index
+                )
+                entry.update(
+                    recipe=outcome, shopping_list=shopping, have_items=have_items
+                )
+            results.append(entry)
+            shopping_lists.append(shopping)
+
+        with self._lock:
+            self._stats["plans"] += 1
+            self._stats["calls"] += len(calls)
+            self._stats["failed"] += failed
+            self._stats["timed_out"] += timed_out
+        return {
+            "meals": results,
+            "shopping_list": merge_shopping_lists(shopping_lists),
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats["max_workers"] = self.max_workers
+        stats["call_timeout_seconds"] = self.call_timeout_seconds
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,322 @@
+"""Per-stage request timing, Prometheus metrics and slow-request profiles.
+
+Wrap a piece of work in ``stage("name")`` to time it. The duration is
+observed in the ``recipe_genie_stage_seconds`` histogram and, inside a
+request, added to that response's ``Server-Timing`` header. ``init_app``
+also records per-endpoint request latency and status counts; ``render()``
+produces the Prometheus text exposition served at ``/metrics``.
+"""
+
+import bisect
+import cProfile
+import math
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, has_request_context, request
+
+# Seconds; spans a cache hit (sub-millisecond) to a slow model call
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label combination."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (per-bucket counts incl. +Inf, sum)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((k, (list(c), s)) for k, (c, s) in self._series.items())
+        names = self.labelnames + ("le",)
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "recipe_genie_stage_seconds",
+        "Time spent in each stage of request handling.",
+        ["stage"],
+    )
+)
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "recipe_genie_request_duration_seconds",
+        "Request latency by endpoint and method.",
+        ["endpoint", "method"],
+    )
+)
+REQUESTS_TOTAL = REGISTRY.register(
+    Counter(
+        "recipe_genie_requests_total",
+        "Requests by endpoint, method and status code.",
+        ["endpoint", "method", "status"],
+    )
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as ``name`` (repeated stages add up)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        if has_request_context():
+            timings = g.setdefault("stage_timings", {})
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class SlowRequestProfiler:
+    """Profile a random sample of requests and keep the slow ones.
+
+    A sampled request runs under ``cProfile``; if it takes at least
+    ``threshold_seconds`` its stats are written to ``dump_dir`` as
+    ``<timestamp>-<ms>ms-<endpoint>.prof`` (open with ``python -m pstats`` or
+    snakeviz). Only one request is profiled at a time and the newest
+    ``max_files`` dumps are kept.
+    """
+
+    def __init__(
+        self,
+        dump_dir: str,
+        sample_rate: float = 0.01,
+        threshold_seconds: float = 1.0,
+        max_files: int = 50,
+    ) -> None:
+        self.dump_dir = dump_dir
+        self.sample_rate = sample_rate
+        self.threshold_seconds = threshold_seconds
+        self.max_files = max_files
+        self.sampled = 0
+        self.dumped = 0
+        self._busy = threading.Lock()
+        self._random = random.Random()
+
+    def start(self) -> Optional[cProfile.Profile]:
+        if self._random.random() >= self.sample_rate:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler is active in this process
+            self._busy.release()
+            return None
+        self.sampled += 1
+        return profile
+
+    def stop(
+        self, profile: cProfile.Profile, elapsed: float, label: str
+    ) -> Optional[str]:
+        profile.disable()
+        try:
+            if elapsed < self.threshold_seconds:
+                return None
+            os.makedirs(self.dump_dir, exist_ok=True)
+            safe_label = re.sub(r"[^A-Za-z0-9_.-]", "_", label)
+            path = os.path.join(
+                self.dump_dir,
+                f"{time.strftime('%Y%m%dT%H%M%S')}-{int(elapsed * 1000)}ms-{safe_label}.prof",
+            )
+            profile.dump_stats(path)
+            self.dumped += 1
+            self._prune()
+            return path
+        finally:
+            self._busy.release()
+
+    def _prune(self) -> None:
+        dumps = sorted(
+            (
+                entry
+                for entry in os.scandir(self.dump_dir)
+                if entry.name.endswith(".prof")
+            ),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in dumps[: max(len(dumps) - self.max_files, 0)]:
+            os.remove(entry.path)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "sample_rate": self.sample_rate,
+            "threshold_seconds": self.threshold_seconds,
+            "sampled": self.sampled,
+            "dumped": self.dumped,
+        }
+
+
+def init_app(
+    app: Flask,
+    server_timing: Callable[[], bool] = lambda: True,
+    profiler: Optional[SlowRequestProfiler] = None,
+) -> None:
+    """Time every request; ``server_timing()`` decides who sees the header."""
+
+    @app.before_request
+    def _start_timer() -> None:
+        g.request_started = time.perf_counter()
+        g.profile = profiler.start() if profiler is not None else None
+
+    @app.after_request
+    def _record(response: Response) -> Response:
+        started = g.get("request_started")
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or "unmatched"
+        REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method)
+        REQUESTS_TOTAL.inc(
+            endpoint=endpoint, method=request.method, status=str(response.status_code)
+        )
+        if server_timing():
+            response.headers["Server-Timing"] = server_timing_header(
+                g.get("stage_timings", {}), elapsed
+            )
+        return response
+
+    @app.teardown_request
+    def _stop_profile(_exc: Optional[BaseException]) -> None:
+        profile = g.pop("profile", None)
+        if profile is not None:
+            started = g.get("request_started", time.perf_counter())
+            profiler.stop(
+                profile, time.perf_counter() - started, request.endpoint or "unmatched"
+            )
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Stats:
+    __slots__ = (
+        "config",
+        "created_at",
+        "construction_ms",
+        "first_call_ms",
+        "calls",
+        "reloads",
+    )
+
+    def __init__(self, config: Dict[str, Any], construction_ms: float, reloads: int):
+        self.config = config
+        self.created_at = time.time()
+        self.construction_ms = construction_ms
+        self.first_call_ms: Optional[float] = None
+        self.calls = 0
+        self.reloads = reloads
+
+
+class TimedModel:
+    """Thin proxy over a model client that records call latency."""
+
+    def __init__(self, model: Any, stats: _Stats, lock: threading.Lock) -> None:
+        self._model = model
+        self._stats = stats
+        self._lock = lock
+
+    def _record(self, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats.calls += 1
+            if self._stats.first_call_ms is None:
+                self._stats.first_call_ms = elapsed_ms
+
+    def generate_content(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self._model.generate_content(*args, **kwargs)
+        finally:
+            self._record(started)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
+
+
+class ModelRegistry:
+    """Process-wide cache of model clients.
+
+    Each ``slot`` holds one client built by ``factory(**config)``. The client
+    is reused for as long as the factory and config stay the same; when either
+    changes (e.g. ``GEMINI_MODEL`` was edited) the slot is rebuilt on the next
+    ``get``. Construction and first-call latency are recorded per slot.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Tuple[Any, ...], TimedModel, _Stats]] = {}
+
+    def get(
+        self, factory: Callable[..., Any], slot: str = "default", **config: Any
+    ) -> TimedModel:
+        signature = (factory, tuple(sorted(config.items())))
+        entry = self._entries.get(slot)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            reloads = entry[2].reloads + 1 if entry is not None else 0
+            started = time.perf_counter()
+            model = factory(**config)
+            stats = _Stats(config, (time.perf_counter() - started) * 1000, reloads)
+            client = TimedModel(model, stats, self._lock)
+            self._entries[slot] = (signature, client, stats)
+            return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                slot: {
+                    **{k: v for k, v in stats.config.items() if isinstance(v, str)},
+                    "created_at": stats.created_at,
+                    "construction_ms": round(stats.construction_ms, 3),
+                    "first_call_ms": (
+                        round(stats.first_call_ms, 3)
+                        if stats.first_call_ms is not None
+                        else None
+                    ),
+                    "calls": stats.calls,
+                    "reloads": stats.reloads,
+                }
+                for slot, (_sig, _client, stats) in self._entries.items()
+            }
@@ -0,0 +1,66 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Bounded memo for repeated ingredient names
+CACHE_SIZE = 4096
+
+_SPLIT_RE = re.compile(r"[\n,]")
+_BRACKETS = frozenset("()[]{}")
+
+
+class _TranslationTable(Dict[int, Optional[int]]):
+    """``str.translate`` table doing the character-level cleanup in one pass.
+
+    Brackets and whitespace become a space; ``a-z``, ``0-9`` and ``-`` are
+    kept; every other character is deleted. Non-ASCII code points are
+    resolved on first sight and remembered.
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        ch = chr(codepoint)
+        value: Optional[int]
+        if ch in _BRACKETS or ch.isspace():
+            value = 32
+        elif "a" <= ch <= "z" or "0" <= ch <= "9" or ch == "-":
+            value = codepoint
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+_TABLE = _TranslationTable()
+for _codepoint in range(128):
+    _TABLE[_codepoint]  # precompute ASCII
+
+
+def _normalize(name: str) -> str:
+    s = name.lower().strip().translate(_TABLE)
+    words = s.split()
+    if not words:
+        return ""
+    core = " ".join(words)
+    # Simple plural trim: remove a single trailing 's'. Like the original
+    # regex pipeline, this only applies when no separator followed the word
+    # and counts a leading separator towards the minimum length.
+    if s[-1] != " " and core.endswith("s") and len(core) + (s[0] == " ") > 2:
+        core = core[:-1].rstrip()
+    return core
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """Lowercase, strip punctuation, collapse whitespace and trim a plural 's'."""
+    return _normalize(name)
+
+
+def normalize_many(names: Iterable[str]) -> List[str]:
+    """Normalize a batch of names, reusing the memo for repeats."""
+    cached = normalize_name
+    return [cached(name) for name in names]
+
+
+def split_ingredients(raw: str) -> List[str]:
+    """Split a free-text pantry on commas and newlines."""
+    return _SPLIT_RE.split(raw)
@@ -0,0 +1,169 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from normalizer import normalize_many
+
+# Groups of interchangeable ingredient names; normalized when an index is built.
+DEFAULT_ALIASES: Dict[str, List[str]] = {
+    "scallion": ["green onion", "spring onion"],
+    "cilantro": ["coriander leaves", "fresh coriander"],
+    "eggplant": ["aubergine"],
+    "zucchini": ["courgette"],
+    "bell pepper": ["capsicum"],
+    "garbanzo bean": ["chickpea"],
+    "powdered sugar": ["icing sugar", "confectioners sugar"],
+    "baking soda": ["bicarbonate of soda"],
+    "heavy cream": ["double cream", "whipping cream"],
+    "arugula": ["rocket"],
+    "shrimp": ["prawn"],
+}
+
+
+class _Automaton:
+    """Aho-Corasick automaton reporting which pattern occurs in a text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Pattern ending at this state (directly or via a suffix link)
+        self._out: List[Optional[str]] = [None]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+            state = nxt
+        if self._out[state] is None:
+            self._out[state] = pattern
+
+    def _link(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[nxt] is None:
+                    self._out[nxt] = self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Optional[str]:
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state] is not None:
+                return out[state]
+        return None
+
+
+class PantryIndex:
+    """Reusable matcher for normalized pantry names.
+
+    An ingredient matches a pantry item when either name contains the other,
+    the same rule ``diff_shopping_list`` has always used. Exact names are a
+    hash lookup, pantry items contained in the ingredient are found with one
+    Aho-Corasick scan, and ingredients contained in a pantry item with one
+    substring search over the concatenated pantry. Each lookup is therefore
+    linear in the ingredient and pantry text instead of
+    ingredients x pantry comparisons.
+
+    ``aliases`` maps a name to equivalent names (e.g. "scallion" and
+    "green onion"); pantry items mentioning any of them are indexed under
+    every spelling.
+    """
+
+    _SEPARATOR = "\x00"
+
+    def __init__(
+        self,
+        available: Iterable[str],
+        aliases: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        if aliases is None:
+            aliases = DEFAULT_ALIASES
+        groups = [normalize_many([key, *values]) for key, values in aliases.items()]
+
+        # indexed spelling -> pantry item it came from
+        self._names: Dict[str, str] = {}
+        for item in available:
+            item = str(item) if item else ""
+            if not item or item in self._names:
+                continue
+            self._names[item] = item
+            for variant in self._variants(item, groups):
+                self._names.setdefault(variant, item)
+
+        self._automaton = _Automaton(self._names)
+        self._haystack, self._offsets = self._join(self._names)
+
+    def __len__(self) -> int:
+        return len(set(self._names.values()))
+
+    @staticmethod
+    def _variants(item: str, groups: List[List[str]]) -> List[str]:
+        variants = []
+        for group in groups:
+            for member in group:
+                if member in item:
+                    variants.extend(
+                        item.replace(member, other)
+                        for other in group
+                        if other != member
+                    )
+        return variants
+
+    @classmethod
+    def _join(cls, names: Iterable[str]) -> Tuple[str, List[int]]:
+        offsets = []
+        pieces = []
+        pos = 0
+        for name in names:
+            offsets.append(pos)
+            pieces.append(name)
+            pos += len(name) + 1
+        return cls._SEPARATOR.join(pieces), offsets
+
+    def match(self, name: str) -> Optional[str]:
+        """Return the pantry item matching a normalized ingredient name."""
+        if not self._names:
+            return None
+        hit = self._names.get(name)
+        if hit is not None:
+            return hit
+        if not name:
+            # An empty name is contained in every pantry item
+            return next(iter(self._names.values()))
+        contained = self._automaton.find(name)
+        if contained is not None:
+            return self._names[contained]
+        pos = self._haystack.find(name)
+        if pos >= 0:
+            spelling = self._spelling_at(pos)
+            return self._names[spelling]
+        return None
+
+    def _spelling_at(self, pos: int) -> str:
+        idx = bisect_right(self._offsets, pos) - 1
+        start = self._offsets[idx]
+        end = self._haystack.find(self._SEPARATOR, start)
+        return self._haystack[start : end if end >= 0 else len(self._haystack)]
+
+    def __contains__(self, name: str) -> bool:
+        return self.match(name) is not None
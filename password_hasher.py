@@ -0,0 +1,171 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional
+
+DEFAULT_ITERATIONS = 260000
+
+try:
+    from werkzeug.security import generate_password_hash, check_password_hash  # type: ignore
+except Exception:  # pragma: no cover - fallback if werkzeug is unavailable
+
+    def _pbkdf2_hash(password: str, salt: bytes, iterations: int) -> str:
+        dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+        return base64.b64encode(dk).decode("ascii")
+
+    def generate_password_hash(
+        password: str, method: str = f"pbkdf2:sha256:{DEFAULT_ITERATIONS}"
+    ) -> str:
+        iterations = int(method.rsplit(":", 1)[1])
+        salt = os.urandom(16)
+        salt_b64 = base64.b64encode(salt).decode("ascii")
+        h = _pbkdf2_hash(password, salt, iterations)
+        return f"pbkdf2:sha256:{iterations}${salt_b64}${h}"
+
+    def check_password_hash(pwhash: str, password: str) -> bool:
+        try:
+            prefix, rest = pwhash.split(":sha256:")
+            iterations_s, tail = rest.split("$", 1)
+            salt_b64, stored = tail.split("$", 1)
+            iterations = int(iterations_s)
+            salt = base64.b64decode(salt_b64)
+            calc = _pbkdf2_hash(password, salt, iterations)
+            return hmac.compare_digest(calc, stored)
+        except Exception:
+            return False
+
+
+def pbkdf2_method(iterations: int) -> str:
+    return f"pbkdf2:sha256:{iterations}"
+
+
+class PasswordHashError(Exception):
+    """Hashing could not be completed (pool busy, timed out or broken)."""
+
+
+class HasherBusy(PasswordHashError):
+    """Raised when ``max_pending`` hash operations are already queued."""
+
+
+# Run in worker processes, so they must be importable top-level functions.
+def _hash(password: str, method: str) -> str:
+    return generate_password_hash(password, method=method)
+
+
+def _verify(pwhash: str, password: str) -> bool:
+    return check_password_hash(pwhash, password)
+
+
+class PasswordHasher:
+    """PBKDF2 hashing and verification off the request thread.
+
+    Work runs in a process pool of ``max_workers`` (``0`` runs inline, e.g.
+    for tests and scripts). At most ``max_pending`` operations are queued or
+    running; beyond that ``HasherBusy`` is raised instead of piling up
+    requests. A caller waits at most ``timeout_seconds`` for a result.
+    """
+
+    def __init__(
+        self,
+        iterations: int = DEFAULT_ITERATIONS,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        timeout_seconds: float = 5.0,
+    ) -> None:
+        self.method = pbkdf2_method(iterations)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {
+            "hash": deque(maxlen=512),
+            "verify": deque(maxlen=512),
+        }
+        self._stats = {"hash": 0, "verify": 0, "rejected": 0, "timeouts": 0}
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Started on first use so importing the app does not spawn processes
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _call(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        if self.max_workers <= 0:
+            result = fn(*args)
+        else:
+            result = self._submit(fn, *args)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats[op] += 1
+            self._latencies[op].append(elapsed_ms)
+        return result
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise HasherBusy("Too many password checks in progress")
+        try:
+            future: Future = self._pool().submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._slots.release()
+            self._reset()
+            raise PasswordHashError(str(e)) from e
+        future.add_done_callback(lambda _f: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PasswordHashError("Password hashing timed out") from None
+        except BrokenProcessPool as e:
+            self._reset()
+            raise PasswordHashError(str(e)) from e
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def hash(self, password: str) -> str:
+        return self._call("hash", _hash, password, self.method)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return self._call("verify", _verify, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """True if ``pwhash`` was made with a different method or cost."""
+        return pwhash.split("$", 1)[0] != self.method
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            latencies = {op: sorted(v) for op, v in self._latencies.items()}
+        for op, values in latencies.items():
+            if values:
+                stats[f"{op}_p50_ms"] = round(values[len(values) // 2], 3)
+                stats[f"{op}_p95_ms"] = round(values[int(len(values) * 0.95)], 3)
+                stats[f"{op}_max_ms"] = round(values[-1], 3)
+        stats["method"] = self.method
+        stats["max_workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
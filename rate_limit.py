@@ -0,0 +1,190 @@
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import db
+
+
+class Policy(NamedTuple):
+    limit: int
+    window_seconds: float
+
+
+def parse_policy(spec: str) -> Optional[Policy]:
+    """Parse ``"<limit>/<seconds>"`` (e.g. ``"10/60"``); empty or ``"0"`` disables."""
+    spec = spec.strip()
+    if not spec or spec == "0":
+        return None
+    limit, _, window = spec.partition("/")
+    return Policy(int(limit), float(window or 60))
+
+
+# (window_start, previous window count, current window count)
+_State = Tuple[float, int, int]
+
+
+def sliding_window(
+    state: Optional[_State], policy: Policy, now: float, cost: int = 1
+) -> Tuple[_State, Optional[float]]:
+    """Apply one hit to a sliding-window counter.
+
+    The count for the last ``window_seconds`` is estimated from the current
+    fixed window plus the overlapping share of the previous one, so each key
+    needs only three numbers. Returns the new state and ``None`` if the hit
+    is allowed, or the unchanged state and the seconds to wait if not.
+    """
+    window = policy.window_seconds
+    window_start = now - now % window
+    previous = current = 0
+    if state is not None:
+        if state[0] == window_start:
+            previous, current = state[1], state[2]
+        elif state[0] == window_start - window:
+            previous = state[2]
+    elapsed = now - window_start
+    estimate = previous * (1 - elapsed / window) + current
+    if estimate + cost <= policy.limit:
+        return (window_start, previous, current + cost), None
+
+    room = policy.limit - cost - current
+    if cost > policy.limit:
+        retry_after = window
+    elif room >= 0 and previous:
+        # Wait for enough of the previous window to slide out
+        retry_after = window * (1 - room / previous) - elapsed
+    else:
+        # Wait for the window to roll over and part of this one to slide out
+        keep = (policy.limit - cost) / current if current else 1.0
+        retry_after = (window - elapsed) + window * (1 - keep)
+    return (window_start, previous, current), max(retry_after, 0.001)
+
+
+class MemoryStore:
+    """Per-process counters; expired keys are swept every ``sweep_seconds``."""
+
+    def __init__(self, sweep_seconds: float = 60.0) -> None:
+        self.sweep_seconds = sweep_seconds
+        self._counters: Dict[str, Tuple[_State, float]] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def hit(self, key: str, policy: Policy, now: float, cost: int = 1):
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            entry = self._counters.get(key)
+            state, retry_after = sliding_window(
+                entry[0] if entry else None, policy, now, cost
+            )
+            if retry_after is None:
+                # Nothing left to remember two windows from now
+                self._counters[key] = (state, state[0] + 2 * policy.window_seconds)
+            return retry_after
+
+    def _sweep(self, now: float) -> None:
+        expired = [k for k, (_s, expires) in self._counters.items() if expires <= now]
+        for key in expired:
+            del self._counters[key]
+        self._next_sweep = now + self.sweep_seconds
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class SQLiteStore:
+    """Counters shared by all worker processes through a SQLite table."""
+
+    def __init__(self, db_path: str, sweep_seconds: float = 60.0) -> None:
+        self.db_path = db_path
+        self.sweep_seconds = sweep_seconds
+        self._next_sweep = 0.0
+        with db.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    window_start REAL NOT NULL,
+                    previous INTEGER NOT NULL,
+                    current INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    def hit(self, key: str, policy: Policy, now: float, cost: int = 1):
+        with db.connect(self.db_path) as conn:
+            # Take the write lock up front so the read-modify-write is atomic
+            conn.execute("BEGIN IMMEDIATE")
+            if now >= self._next_sweep:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+                self._next_sweep = now + self.sweep_seconds
+            row = conn.execute(
+                "SELECT window_start, previous, current FROM rate_limits WHERE key = ?",
+                (key,),
+            ).fetchone()
+            state, retry_after = sliding_window(
+                tuple(row) if row else None, policy, now, cost
+            )
+            if retry_after is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits"
+                    " (key, window_start, previous, current, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, *state, state[0] + 2 * policy.window_seconds),
+                )
+        return retry_after
+
+
+class RateLimiter:
+    """Named policies applied to one or more client identities.
+
+    ``hit(bucket, identities)`` counts a request against every identity
+    (e.g. ``"ip:1.2.3.4"`` and ``"user:a@b.c"``) and returns the seconds to
+    wait if any of them is over its limit, else ``None``.
+    """
+
+    def __init__(self, policies: Dict[str, Policy], store=None) -> None:
+        self.policies = policies
+        self.store = store if store is not None else MemoryStore()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def hit(
+        self, bucket: str, identities: Iterable[str], cost: int = 1
+    ) -> Optional[float]:
+        policy = self.policies.get(bucket)
+        if policy is None:
+            return None
+        now = time.time()
+        retry_after = None
+        for identity in identities:
+            retry_after = self.store.hit(f"{bucket}:{identity}", policy, now, cost)
+            if retry_after is not None:
+                break
+        with self._lock:
+            counts = self._stats.setdefault(bucket, {"allowed": 0, "limited": 0})
+            counts["allowed" if retry_after is None else "limited"] += 1
+        return retry_after
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            stats: Dict[str, Dict[str, object]] = {
+                bucket: dict(counts) for bucket, counts in self._stats.items()
+            }
+        for bucket, policy in self.policies.items():
+            stats.setdefault(bucket, {"allowed": 0, "limited": 0}).update(
+                limit=policy.limit, window_seconds=policy.window_seconds
+            )
+        return stats
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def identities(ip: Optional[str], user: Optional[str]) -> List[str]:
+    keys = [f"ip:{ip or 'unknown'}"]
+    if user:
+        keys.append(f"user:{user}")
+    return keys
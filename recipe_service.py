@@ -1,79 +1,125 @@
 import os
 import json
-import re
-from typing import Dict, Any, List, Tuple
+import hashlib
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 
-# Google Gemini (configured in app.py). Import lazily/fallback for test environments without the package.
-try:
-    import google.generativeai as genai  # type: ignore
-except (
-    Exception
-):  # pragma: no cover - fallback for environments without google-generativeai
+import json_stream
+import metrics
+from model_registry import ModelRegistry
+from normalizer import normalize_many, normalize_name, split_ingredients
+from pantry_index import PantryIndex
 
-    class _GenAIStub:
-        class GenerativeModel:
-            def __init__(self, *args, **kwargs):
-                # This will be monkeypatched in tests; if used directly, raise to signal misconfiguration.
-                raise RuntimeError(
-                    "google-generativeai is not installed; configure genai in app or monkeypatch in tests"
-                )
 
-    genai = _GenAIStub()  # type: ignore
+class _LazyGenAI:
+    """Stands in for ``google.generativeai`` until a model is first needed.
+
+    Importing the SDK costs about a second, so it is deferred to the first
+    attribute access. ``configure()`` calls made before then are replayed
+    once the SDK is loaded. Tests monkeypatch ``genai`` with a fake.
+    """
+
+    def __init__(self) -> None:
+        self._module: Any = None
+        self._lock = threading.Lock()
+        self._pending_config: Optional[Dict[str, Any]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def configure(self, **kwargs: Any) -> None:
+        if self._module is None:
+            self._pending_config = kwargs
+        else:
+            self._module.configure(**kwargs)
+
+    @staticmethod
+    def _import() -> Any:
+        try:
+            import google.generativeai as module  # type: ignore
+        except Exception:  # pragma: no cover - SDK not installed
+            return _GenAIStub()
+        return module
+
+    def _load(self) -> Any:
+        with self._lock:
+            if self._module is None:
+                module = self._import()
+                if self._pending_config is not None:
+                    module.configure(**self._pending_config)
+                self._module = module
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._module or self._load(), name)
+
+
+class _GenAIStub:
+    class GenerativeModel:
+        def __init__(self, *args, **kwargs):
+            # This will be monkeypatched in tests; if used directly, raise to signal misconfiguration.
+            raise RuntimeError(
+                "google-generativeai is not installed; configure genai in app or monkeypatch in tests"
+            )
+
+    def configure(self, **kwargs: Any) -> None:
+        pass
+
+
+# Google Gemini, configured in app.py
+genai: Any = _LazyGenAI()
+
+
+DEFAULT_MODEL_NAME = "gemini-1.5-flash"
+
+SYSTEM_INSTRUCTION = (
+    "You are Recipe Genie, a helpful culinary assistant. Always produce"
+    " well-structured recipes as valid JSON strictly following the schema."
+)
+
+# Model clients are built once per (model name, system instruction) and shared
+# by all requests and threads.
+MODEL_REGISTRY = ModelRegistry()
 
 
 def get_model():
-    """Configure and return a Gemini model instance.
+    """Return the shared Gemini model client for ``GEMINI_MODEL``.
+
+    The client is rebuilt only when ``GEMINI_MODEL`` changes.
     Note: genai.configure(api_key=...) is expected to be called by the app on startup.
     """
-    return genai.GenerativeModel(
-        model_name=os.environ.get("GEMINI_MODEL", "gemini-1.5-flash"),
-        system_instruction=(
-            "You are Recipe Genie, a helpful culinary assistant. Always produce"
-            " well-structured recipes as valid JSON strictly following the schema."
-        ),
+    return MODEL_REGISTRY.get(
+        genai.GenerativeModel,
+        model_name=os.environ.get("GEMINI_MODEL", DEFAULT_MODEL_NAME),
+        system_instruction=SYSTEM_INSTRUCTION,
     )
 
 
-def normalize_name(name: str) -> str:
-    s = name.lower().strip()
-    s = re.sub(r"[()\[\]{}]", " ", s)
-    s = re.sub(r"[^a-z0-9\s\-]", "", s)
-    s = re.sub(r"\s+", " ", s)
-    # Simple plural trim: remove a single trailing 's' for basic normalization
-    if s.endswith("s") and len(s) > 2:
-        s = s[:-1]
-    return s.strip()
-
-
 def parse_available_ingredients(raw: str) -> List[str]:
     if not raw:
         return []
-    parts = re.split(r"[\n,]", raw)
-    result = []
-    for p in parts:
-        normalized = normalize_name(p)
-        if normalized and isinstance(normalized, str):
-            result.append(normalized)
-    return result
+    return [name for name in normalize_many(split_ingredients(raw)) if name]
 
 
 def diff_shopping_list(
     recipe_ingredients: List[Dict[str, Any]],
     available: List[str],
+    index: Optional[PantryIndex] = None,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    """Return (shopping_list, have_list). Match by normalized ingredient name containment."""
-    have = set(str(item) for item in available if item)
+    """Return (shopping_list, have_list). Match by normalized ingredient name containment.
+
+    Pass a prebuilt ``index`` to reuse it across recipes (``available`` is
+    then ignored).
+    """
+    if index is None:
+        index = PantryIndex(available)
     shopping: List[Dict[str, Any]] = []
     have_items: List[Dict[str, Any]] = []
 
     for item in recipe_ingredients:
         name = normalize_name(item.get("name", ""))
-        matched = False
-        for have_name in have:
-            if name == have_name or name in have_name or have_name in name:
-                matched = True
-                break
-        if matched:
+        if index.match(name) is not None:
             have_items.append(item)
         else:
             shopping.append(item)
@@ -116,51 +162,188 @@ RECIPE_JSON_SCHEMA: Dict[str, Any] = {
     "required": ["title", "ingredients", "steps"],
 }
 
+GENERATION_CONFIG: Dict[str, Any] = {
+    "temperature": 0.8,
+    "top_p": 0.95,
+    "top_k": 40,
+    "response_mime_type": "application/json",
+    "response_schema": RECIPE_JSON_SCHEMA,
+}
 
-def build_prompt(
-    user_query: str,
-    available: List[str],
-    servings: str,
-    cuisine: str,
-    time_pref: str,
-) -> str:
-    parts = [
-        "Generate one excellent cooking recipe as JSON.",
-        "Follow this JSON schema strictly:",
-        json.dumps(RECIPE_JSON_SCHEMA),
+
+_PROMPT_HEADER = "Generate one excellent cooking recipe as JSON."
+_PROMPT_CONSTRAINTS = "\n".join(
+    [
         "Constraints:",
         "- Keep ingredient names simple and common (no brand names).",
         "- Provide clear step-by-step instructions.",
         "- Use metric or common US units appropriately.",
         "- Keep the title short, around 4-5 words.",
     ]
-    if user_query:
-        parts.append(f"User request: {user_query}")
-    if available:
-        parts.append(
-            "These ingredients are available at home; prefer using them where reasonable: "
-            + ", ".join(available)
-        )
+)
+_PROMPT_SUFFIX = "Return ONLY JSON. No markdown, no code fences, no commentary."
+_PANTRY_LEAD = (
+    "These ingredients are available at home; prefer using them where reasonable: "
+)
+
+# Static prompt text, built once. The schema-free variant is for calls that
+# already pass RECIPE_JSON_SCHEMA as ``response_schema``.
+PROMPT_PREFIX_WITH_SCHEMA = "\n".join(
+    [
+        _PROMPT_HEADER,
+        "Follow this JSON schema strictly:",
+        json.dumps(RECIPE_JSON_SCHEMA),
+        _PROMPT_CONSTRAINTS,
+    ]
+)
+PROMPT_PREFIX = "\n".join([_PROMPT_HEADER, _PROMPT_CONSTRAINTS])
+
+
+def rank_pantry(available: List[str], user_query: str) -> List[str]:
+    """Deduplicate the pantry, putting items mentioned in the query first."""
+    query = user_query.lower()
+    unique = list(dict.fromkeys(name for name in available if name))
+    mentioned = [name for name in unique if name in query]
+    if not mentioned:
+        return unique
+    mentioned_set = set(mentioned)
+    return mentioned + [name for name in unique if name not in mentioned_set]
+
+
+def build_prompt_with_stats(
+    user_query: str,
+    available: List[str],
+    servings: str,
+    cuisine: str,
+    time_pref: str,
+    include_schema: bool = True,
+    max_chars: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the prompt and report its size.
+
+    With ``max_chars`` the pantry is ranked (query mentions first) and cut
+    to fit the budget; if the rest of the prompt alone is over budget the
+    user request is shortened as well. Token counts are estimated at four
+    characters per token.
+    """
+    parts = [PROMPT_PREFIX_WITH_SCHEMA if include_schema else PROMPT_PREFIX]
+    details = []
     if servings:
-        parts.append(f"Target servings: {servings}")
+        details.append(f"Target servings: {servings}")
     if cuisine:
-        parts.append(f"Preferred cuisine: {cuisine}")
+        details.append(f"Preferred cuisine: {cuisine}")
     if time_pref:
-        parts.append(f"Time preference: {time_pref}")
-    parts.append("Return ONLY JSON. No markdown, no code fences, no commentary.")
-    return "\n".join(parts)
+        details.append(f"Time preference: {time_pref}")
+
+    pantry = rank_pantry(available, user_query)
+    if max_chars is not None:
+        fixed = sum(len(p) + 1 for p in parts + details) + len(_PROMPT_SUFFIX)
+        if user_query:
+            request_lead = "User request: "
+            room = max(max_chars - fixed - len(request_lead) - 1, 0)
+            user_query = user_query[:room]
+            fixed += len(request_lead) + len(user_query) + 1
+        room = max_chars - fixed - len(_PANTRY_LEAD) - 1
+        kept: List[str] = []
+        used = 0
+        for name in pantry:
+            cost = len(name) + (2 if kept else 0)
+            if used + cost > room:
+                break
+            kept.append(name)
+            used += cost
+        pantry = kept
+
+    if user_query:
+        parts.append(f"User request: {user_query}")
+    if pantry:
+        parts.append(_PANTRY_LEAD + ", ".join(pantry))
+    parts.extend(details)
+    parts.append(_PROMPT_SUFFIX)
+    prompt = "\n".join(parts)
+    stats = {
+        "chars": len(prompt),
+        "approx_tokens": (len(prompt) + 3) // 4,
+        "schema_included": include_schema,
+        "pantry_items": len(pantry),
+        "pantry_dropped": len(available) - len(pantry),
+    }
+    return prompt, stats
+
+
+def build_prompt(
+    user_query: str,
+    available: List[str],
+    servings: str,
+    cuisine: str,
+    time_pref: str,
+    include_schema: bool = True,
+    max_chars: Optional[int] = None,
+) -> str:
+    prompt, _stats = build_prompt_with_stats(
+        user_query,
+        available,
+        servings,
+        cuisine,
+        time_pref,
+        include_schema=include_schema,
+        max_chars=max_chars,
+    )
+    return prompt
+
+
+def request_cache_key(
+    user_query: str,
+    available: List[str],
+    servings: str,
+    cuisine: str,
+    time_pref: str,
+) -> str:
+    """Stable key for a generation request.
+
+    Inputs are canonicalized (case, whitespace, pantry order and duplicates)
+    so that near-identical submissions share a key.
+    """
+    canonical = {
+        "query": " ".join(user_query.lower().split()),
+        "available": sorted(set(available)),
+        "servings": " ".join(servings.lower().split()),
+        "cuisine": " ".join(cuisine.lower().split()),
+        "time_pref": " ".join(time_pref.lower().split()),
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_recipe_json(text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Extract the JSON object from a model response.
+
+    Returns the object and a list describing any defects that were repaired
+    (truncation, trailing commas, unclosed strings, ...).
+    """
+    return json_stream.parse_json_object(text)
+
+
+def ensure_recipe_fields(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    recipe.setdefault("title", "Your Custom Recipe")
+    recipe.setdefault("ingredients", [])
+    recipe.setdefault("steps", [])
+    return recipe
+
+
+def generate_recipe(
+    model: Any, prompt: str, generation_config: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Call the model and parse its reply into (recipe, repairs applied)."""
+    with metrics.stage("model"):
+        response = model.generate_content(prompt, generation_config=generation_config)
+        text = response.text
+    with metrics.stage("json"):
+        recipe, fixes = parse_recipe_json(text)
+        return ensure_recipe_fields(recipe), fixes
 
 
 def safe_json_from_text(text: str) -> Dict[str, Any]:
     """Attempt to extract JSON object from text."""
-    # Trim code fences if present
-    fence = re.compile(r"^\s*```(?:json)?\s*(.*)\s*```\s*$", re.DOTALL)
-    m = fence.match(text)
-    if m:
-        text = m.group(1)
-    # Find first { ... } block
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        text = text[start : end + 1]
-    return json.loads(text)
+    recipe, _fixes = parse_recipe_json(text)
+    return recipe
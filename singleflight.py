@@ -0,0 +1,95 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class FlightTimeout(TimeoutError):
+    """Raised to a waiter whose call didn't finish within its timeout."""
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs ``fn`` in its own thread;
+    callers arriving while it runs wait for its outcome instead of calling
+    ``fn`` again. Every waiter gets the leader's result (the same object, so
+    treat it as read-only) or has the leader's exception raised. A waiter
+    gives up with ``FlightTimeout`` after its timeout without affecting the
+    leader or the other waiters. Nothing is remembered once a call finishes;
+    caching results is the caller's job.
+    """
+
+    def __init__(self, timeout_seconds: Optional[float] = None) -> None:
+        self.timeout_seconds = timeout_seconds
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "shared_errors": 0,
+            "timeouts": 0,
+        }
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+    ) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for waiters."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+                self._stats["calls"] += 1
+            else:
+                flight.waiters += 1
+                leader = False
+                self._stats["coalesced"] += 1
+
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+                with self._lock:
+                    self._stats["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+            return flight.result, False
+
+        timeout = self.timeout_seconds if timeout is None else timeout
+        if not flight.done.wait(timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise FlightTimeout(
+                f"Timed out after {timeout:.1f}s waiting for an identical request"
+            )
+        if flight.error is not None:
+            with self._lock:
+                self._stats["shared_errors"] += 1
+            raise flight.error
+        return flight.result, True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["in_flight"] = len(self._flights)
+            stats["waiters"] = sum(f.waiters for f in self._flights.values())
+        total = stats["calls"] + stats["coalesced"]
+        # Model calls avoided as a share of all requests that reached us
+        stats["saved_ratio"] = round(stats["coalesced"] / total, 4) if total else 0.0
+        stats["timeout_seconds"] = self.timeout_seconds
+        return stats
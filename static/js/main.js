@@ -31,6 +31,14 @@ document.addEventListener('DOMContentLoaded', () => {
       loadingOverlay.classList.remove('is-hidden');
       generateBtn.disabled = true;
       generateBtn.innerHTML = '<i class="fa-solid fa-spinner fa-spin"></i>&nbsp;Generating...';
+
+      // Stream the recipe when the browser supports it; otherwise let the
+      // regular form POST go through.
+      const streamUrl = recipeForm.dataset.streamUrl;
+      if (streamUrl && window.fetch && window.ReadableStream && window.TextDecoder) {
+        e.preventDefault();
+        streamRecipe(streamUrl, recipeForm, loadingOverlay, generateBtn);
+      }
     });
   }
 
@@ -94,6 +102,131 @@ document.addEventListener('DOMContentLoaded', () => {
   }
 });
 
+function ingredientText(ing) {
+  if (typeof ing !== 'object' || ing === null) return String(ing);
+  let text = ing.name || '';
+  if (ing.quantity) {
+    text += ` - ${ing.quantity}`;
+    if (ing.unit) text += ` ${ing.unit}`;
+  }
+  if (ing.note) text += ` (${ing.note})`;
+  return text;
+}
+
+function appendItem(listId, text) {
+  const li = document.createElement('li');
+  li.className = 'mb-2 animate__animated animate__fadeIn';
+  li.textContent = text;
+  document.getElementById(listId).appendChild(li);
+}
+
+function addTag(className, text) {
+  const tag = document.createElement('span');
+  tag.className = `tag is-light ${className}`;
+  tag.textContent = text;
+  document.getElementById('stream-tags').appendChild(tag);
+}
+
+function renderStreamEvent(name, data, ui) {
+  if (name === 'field') {
+    const value = data.value;
+    if (data.key === 'title') {
+      document.getElementById('stream-title').textContent = value;
+    } else if (data.key === 'summary') {
+      const summary = document.getElementById('stream-summary');
+      summary.textContent = value;
+      summary.classList.remove('is-hidden');
+    } else if (data.key === 'servings') {
+      addTag('is-link', `${value} servings`);
+    } else if (data.key === 'estimated_time_minutes') {
+      addTag('is-warning', `~${value} min`);
+    } else if (data.key === 'cuisine') {
+      addTag('is-success', value);
+    }
+  } else if (name === 'item') {
+    if (data.key === 'ingredients') {
+      appendItem('stream-ingredients', ingredientText(data.value));
+    } else if (data.key === 'steps') {
+      appendItem('stream-steps', String(data.value));
+    } else if (data.key === 'tips') {
+      document.getElementById('stream-tips-block').classList.remove('is-hidden');
+      appendItem('stream-tips', String(data.value));
+    }
+  } else if (name === 'done') {
+    const shopping = document.getElementById('stream-shopping');
+    shopping.innerHTML = '';
+    if (data.shopping_list.length) {
+      data.shopping_list.forEach(ing => appendItem('stream-shopping', ingredientText(ing)));
+    } else {
+      appendItem('stream-shopping', 'Looks like you have everything already!');
+    }
+    ui.finish();
+    if (window.confetti) {
+      confetti({ particleCount: 100, spread: 70, origin: { y: 0.2 } });
+    }
+  } else if (name === 'error') {
+    ui.finish();
+    toast(data.message, 'is-danger');
+  }
+}
+
+async function streamRecipe(url, form, overlay, button) {
+  const result = document.getElementById('stream-result');
+  let revealed = false;
+  const ui = {
+    reveal() {
+      if (revealed) return;
+      revealed = true;
+      overlay.classList.add('is-hidden');
+      result.classList.remove('is-hidden');
+      result.scrollIntoView({ behavior: 'smooth' });
+    },
+    finish() {
+      overlay.classList.add('is-hidden');
+      button.disabled = false;
+      button.innerHTML = '<i class="fa-solid fa-bolt"></i>&nbsp;Generate';
+    },
+  };
+
+  let response;
+  try {
+    response = await fetch(url, { method: 'POST', body: new FormData(form) });
+  } catch (err) {
+    form.submit();
+    return;
+  }
+  const type = response.headers.get('Content-Type') || '';
+  if (!response.ok || !type.startsWith('text/event-stream')) {
+    // Session expired or streaming unavailable: fall back to the full page flow
+    form.submit();
+    return;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let name = 'message';
+      let payload = '';
+      raw.split('\n').forEach(line => {
+        if (line.startsWith('event: ')) name = line.slice(7);
+        else if (line.startsWith('data: ')) payload += line.slice(6);
+      });
+      if (!payload) continue;
+      if (name !== 'error') ui.reveal();
+      renderStreamEvent(name, JSON.parse(payload), ui);
+    }
+  }
+  ui.finish();
+}
+
 function toast(message, type = 'is-success') {
   const n = document.createElement('div');
   n.className = `notification ${type}`;
@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+
+import pytest
+from flask import Flask, render_template_string
+
+import assets
+
+FA_CSS = (
+    "/*! Font Awesome */:root{--fa-style-family:'Font Awesome 6 Free'}"
+    ".fa-solid,.fas{font-weight:900}"
+    ".fa-spin{animation-name:fa-spin}"
+    '.fa-bolt:before{content:"\\f0e7"}'
+    '.fa-anchor:before,.fa-zap:before{content:"\\f13d"}'
+    "@keyframes fa-spin{0%{transform:rotate(0)}to{transform:rotate(1turn)}}"
+    "@font-face{font-family:'Font Awesome 6 Free';"
+    'src:url(../webfonts/fa-solid-900.woff2) format("woff2")}'
+)
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    root = tmp_path / "static"
+    (root / "css").mkdir(parents=True)
+    (root / "js").mkdir()
+    (root / "vendor/fontawesome/css").mkdir(parents=True)
+    (root / "vendor/fontawesome/webfonts").mkdir(parents=True)
+    (root / "css/styles.css").write_text(
+        "/* theme */\nbody {\n  color: red;\n}\n\n.card > .title { margin: 0 ; }\n"
+        + "a :hover { color: blue; }\n" * 20
+    )
+    (root / "js/main.js").write_text("document.body.classList.add('fa-spin');\n")
+    (root / "vendor/fontawesome/css/all.min.css").write_text(FA_CSS)
+    (root / "vendor/fontawesome/webfonts/fa-solid-900.woff2").write_bytes(b"font")
+    return root
+
+
+def test_prune_icon_rules_keeps_used_and_non_icon_rules():
+    pruned = assets.prune_icon_rules(FA_CSS, {"fa-bolt", "fa-solid"})
+    assert ".fa-bolt:before" in pruned
+    assert ".fa-anchor" not in pruned and ".fa-zap" not in pruned
+    assert ".fa-spin{" not in pruned
+    assert ".fa-solid,.fas{font-weight:900}" in pruned
+    assert "@keyframes fa-spin" in pruned and "@font-face" in pruned
+
+
+def test_minify_css():
+    assert (
+        assets.minify_css("/* x */ a :hover , b > c {\n  color: red ;\n}\n")
+        == "a :hover,b>c{color: red}"
+    )
+
+
+def test_build_hashes_compresses_and_rewrites_urls(static_dir, tmp_path):
+    template = tmp_path / "index.html"
+    template.write_text('<i class="fa-solid fa-bolt"></i>')
+    manifest = assets.build(
+        str(static_dir), icon_sources=[str(template), str(static_dir / "js/main.js")]
+    )
+    dist = static_dir / "dist"
+
+    styles = manifest["css/styles.css"]
+    assert styles.startswith("css/styles.") and styles.endswith(".css")
+    minified = (dist / styles).read_text()
+    assert "theme" not in minified and ".card>.title{margin: 0}" in minified
+    assert gzip.decompress((dist / (styles + ".gz")).read_bytes()).decode() == minified
+
+    fa_css = (dist / manifest["vendor/fontawesome/css/all.min.css"]).read_text()
+    font = manifest["vendor/fontawesome/webfonts/fa-solid-900.woff2"]
+    assert f"url(../webfonts/{os.path.basename(font)})" in fa_css
+    assert ".fa-bolt:before" in fa_css and ".fa-spin{" in fa_css
+    assert ".fa-anchor" not in fa_css
+    assert not (dist / (font + ".gz")).exists()
+
+    assert json.loads((dist / "manifest.json").read_text()) == manifest
+
+
+def test_hashed_urls_and_immutable_serving(static_dir):
+    assets.build(str(static_dir), icon_sources=[])
+    app = Flask(__name__, static_folder=str(static_dir))
+    helper = assets.Assets(str(static_dir))
+    helper.init_app(app)
+
+    with app.test_request_context():
+        url = render_template_string("{{ asset_url('css/styles.css') }}")
+        assert url.startswith("/assets/css/styles.")
+        # Not downloaded in this tree, so it falls back to the CDN
+        bulma = render_template_string("{{ asset_url('vendor/bulma.min.css') }}")
+        assert bulma == assets.VENDOR_ASSETS["vendor/bulma.min.css"]
+
+    client = app.test_client()
+    plain = client.get(url)
+    assert plain.status_code == 200
+    assert plain.headers["Cache-Control"] == assets.IMMUTABLE_CACHE_CONTROL
+    assert "Content-Encoding" not in plain.headers
+
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.mimetype == "text/css"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+
+    assert client.get("/assets/missing.css").status_code == 404
+
+
+def test_without_build_falls_back_to_static(static_dir):
+    app = Flask(__name__, static_folder=str(static_dir))
+    assets.Assets(str(static_dir)).init_app(app)
+    with app.test_request_context():
+        assert (
+            render_template_string("{{ asset_url('css/styles.css') }}")
+            == "/static/css/styles.css"
+        )
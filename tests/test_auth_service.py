@@ -4,6 +4,7 @@ from datetime import datetime
 import pytest
 
 import auth_service as auth
+from password_hasher import PasswordHasher
 
 
 @pytest.fixture()
@@ -59,3 +60,21 @@ def test_authenticate_user_nonexistent_returns_false(temp_db):
 
 def test_get_user_by_email_returns_none_for_missing(temp_db):
     assert auth.get_user_by_email(temp_db, "missing@example.com") is None
+
+
+def test_verify_user_upgrades_outdated_hash(temp_db):
+    old = PasswordHasher(iterations=1000, max_workers=0)
+    new = PasswordHasher(iterations=2000, max_workers=0)
+    auth.create_user(temp_db, "Dan", "dan@example.com", "pw", hasher=old)
+    assert auth.get_user_by_email(temp_db, "dan@example.com")[
+        "password_hash"
+    ].startswith("pbkdf2:sha256:1000$")
+
+    assert auth.verify_user(temp_db, "dan@example.com", "wrong", hasher=new) is None
+    row = auth.verify_user(temp_db, "dan@example.com", "pw", hasher=new)
+    assert row["name"] == "Dan"
+
+    stored = auth.get_user_by_email(temp_db, "dan@example.com")["password_hash"]
+    assert stored.startswith("pbkdf2:sha256:2000$")
+    assert auth.authenticate_user(temp_db, "dan@example.com", "pw", hasher=new)
+    assert new.stats()["verify"] == 3
@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+
+import cache_service
+
+
+@pytest.fixture()
+def cache_db(tmp_path):
+    return str(tmp_path / "test_cache.db")
+
+
+def test_set_and_get_roundtrip(cache_db):
+    cache = cache_service.RecipeCache(cache_db)
+    cache.set("k1", {"title": "Soup", "steps": ["boil"]})
+
+    assert cache.get("k1") == {"title": "Soup", "steps": ["boil"]}
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_returned_recipe_is_a_copy(cache_db):
+    cache = cache_service.RecipeCache(cache_db)
+    cache.set("k1", {"title": "Soup", "steps": []})
+
+    cache.get("k1")["steps"].append("mutated")
+    assert cache.get("k1")["steps"] == []
+
+
+def test_lru_eviction_falls_back_to_sqlite(cache_db):
+    cache = cache_service.RecipeCache(cache_db, max_entries=2)
+    cache.set("a", {"title": "A"})
+    cache.set("b", {"title": "B"})
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", {"title": "C"})
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_entries"] == 2
+
+    # Evicted from memory but still persisted
+    assert cache.get("b") == {"title": "B"}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_entries_survive_restart(cache_db):
+    cache_service.RecipeCache(cache_db).set("k1", {"title": "Stew"})
+
+    reopened = cache_service.RecipeCache(cache_db)
+    assert reopened.get("k1") == {"title": "Stew"}
+
+
+def test_expired_entries_are_dropped(cache_db, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    cache = cache_service.RecipeCache(cache_db, ttl_seconds=60)
+    cache.set("k1", {"title": "Old"})
+
+    now[0] += 61
+    assert cache.get("k1") is None
+    assert cache.stats()["expirations"] >= 1
+
+    with sqlite3.connect(cache_db) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM recipe_cache").fetchone()[0]
+    assert count == 0
+
+
+def test_sqlite_tier_is_pruned_to_max_rows(cache_db):
+    cache = cache_service.RecipeCache(cache_db, max_rows=3)
+    for i in range(5):
+        cache.set(f"k{i}", {"title": str(i)})
+
+    with sqlite3.connect(cache_db) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM recipe_cache").fetchone()[0]
+    assert count == 3
+    assert cache.stats()["evictions"] == 2
+
+
+def test_invalidate_and_clear(cache_db):
+    cache = cache_service.RecipeCache(cache_db)
+    cache.set("a", {"title": "A"})
+    cache.set("b", {"title": "B"})
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert cache.get("b") is None
@@ -0,0 +1,84 @@
+import sqlite3
+import threading
+
+import pytest
+
+import db
+
+
+@pytest.fixture()
+def pool(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "pool.db"))
+    yield pool
+    pool.close_all()
+
+
+def test_connections_use_wal_and_row_factory(pool):
+    conn = pool.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.row_factory is sqlite3.Row
+
+
+def test_connection_is_reused_within_a_thread(pool):
+    assert pool.connection() is pool.connection()
+    stats = pool.stats()
+    assert stats["opened"] == 1
+    assert stats["checkouts"] == 2
+
+
+def test_each_thread_gets_its_own_connection(pool):
+    seen = []
+
+    def worker():
+        seen.append(pool.connection())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(c) for c in seen}) == 3
+    assert pool.stats()["open_connections"] == 3
+
+
+def test_connection_is_recycled_after_max_uses(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "recycle.db"), max_uses=2)
+    first = pool.connection()
+    assert pool.connection() is first
+    assert pool.connection() is not first
+    assert pool.stats()["recycled"] == 1
+    pool.close_all()
+
+
+def test_connections_are_not_reused_after_fork(pool):
+    first = pool.connection()
+    pool._pid = -1  # pretend we are a forked child
+    assert pool.connection() is not first
+
+
+def test_with_block_commits_and_rolls_back(pool):
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER UNIQUE)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            conn.execute("INSERT INTO t VALUES (1)")
+
+    rows = pool.connection().execute("SELECT x FROM t").fetchall()
+    assert [r["x"] for r in rows] == [1]
+
+
+def test_health_reports_ok(pool):
+    health = pool.health()
+    assert health["ok"] is True
+    assert health["journal_mode"] == "wal"
+
+
+def test_get_pool_is_shared_per_path(tmp_path):
+    path = str(tmp_path / "shared.db")
+    assert db.get_pool(path) is db.get_pool(path)
+    assert db.connect(path) is db.connect(path)
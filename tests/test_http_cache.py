@@ -0,0 +1,96 @@
+import gzip
+
+import pytest
+from flask import Flask, Response, flash, get_flashed_messages
+
+import http_cache
+
+PAGE = "<html>" + "recipe step " * 500 + "</html>"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    http_cache.init_app(app, min_size=100)
+
+    @app.route("/page")
+    def page():
+        return PAGE
+
+    @app.route("/small")
+    def small():
+        return "ok"
+
+    @app.route("/stream")
+    def stream():
+        return Response((c for c in ["a" * 200, "b" * 200]), mimetype="text/html")
+
+    @app.route("/public")
+    @http_cache.cacheable()
+    def public():
+        return " ".join(get_flashed_messages()) + PAGE
+
+    @app.route("/flash")
+    def add_flash():
+        flash("hello")
+        return "flashed"
+
+    return app.test_client()
+
+
+def test_etag_and_304(client):
+    first = client.get("/page")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache, private"
+
+    again = client.get("/page", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    changed = client.get("/page", headers={"If-None-Match": '"other"'})
+    assert changed.status_code == 200
+
+
+def test_gzip_negotiation(client):
+    plain = client.get("/page")
+    compressed = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert int(compressed.headers["Content-Length"]) < len(plain.data)
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    # Encoded and identity bodies carry different strong ETags
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    revalidated = client.get(
+        "/page",
+        headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": compressed.headers["ETag"],
+        },
+    )
+    assert revalidated.status_code == 304
+
+
+def test_small_and_streamed_responses_are_not_compressed(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert "ETag" in small.headers
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in streamed.headers
+    assert "ETag" not in streamed.headers
+    assert streamed.data == b"a" * 200 + b"b" * 200
+
+
+def test_cacheable_pages(client):
+    response = client.get("/public")
+    assert response.cache_control.public
+    assert response.cache_control.no_cache
+
+    # A page that shows a flash message must not be marked shareable
+    client.get("/flash")
+    flashed = client.get("/public")
+    assert flashed.data.startswith(b"hello")
+    assert not flashed.cache_control.public
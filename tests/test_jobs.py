@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+import jobs
+
+
+def wait_for(queue, job_id, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.status in jobs.FINISHED:
+            return job
+        time.sleep(0.005)
+    raise AssertionError("job did not finish")
+
+
+@pytest.fixture()
+def queue():
+    q = jobs.JobQueue(max_workers=1, max_pending=2, timeout_seconds=5)
+    yield q
+    q.shutdown(wait=False)
+
+
+def test_job_result_and_failure(queue):
+    ok = queue.submit(lambda a, b: a + b, 2, 3, owner="a@example.com", context="ctx")
+    assert wait_for(queue, ok.id).result == 5
+    assert ok.owner == "a@example.com"
+    assert ok.context == "ctx"
+
+    def boom():
+        raise RuntimeError("model exploded")
+
+    bad = queue.submit(boom)
+    job = wait_for(queue, bad.id)
+    assert job.status == jobs.FAILED
+    assert job.error == "model exploded"
+
+    stats = queue.stats()
+    assert stats["done"] == 1
+    assert stats["failed"] == 1
+
+
+def test_queue_full_raises_and_frees_slots(queue):
+    release = threading.Event()
+    running = queue.submit(release.wait)
+    queued = queue.submit(lambda: "later")
+
+    with pytest.raises(jobs.QueueFull):
+        queue.submit(lambda: "rejected")
+    assert queue.stats()["rejected"] == 1
+
+    release.set()
+    wait_for(queue, running.id)
+    assert wait_for(queue, queued.id).result == "later"
+    # Capacity is available again
+    assert wait_for(queue, queue.submit(lambda: 1).id).status == jobs.DONE
+
+
+def test_cancel_queued_job_releases_its_slot(queue):
+    release = threading.Event()
+    running = queue.submit(release.wait)
+    queued = queue.submit(lambda: "never")
+
+    assert queue.cancel(queued.id) is True
+    assert queue.get(queued.id).status == jobs.CANCELLED
+    assert queue.cancel(queued.id) is False
+
+    # The cancelled job's slot can be reused while the first still runs
+    extra = queue.submit(lambda: "extra")
+    release.set()
+    assert wait_for(queue, extra.id).result == "extra"
+    assert wait_for(queue, running.id).status == jobs.DONE
+
+
+def test_running_job_times_out():
+    queue = jobs.JobQueue(max_workers=1, max_pending=1, timeout_seconds=0.05)
+    release = threading.Event()
+    job = queue.submit(release.wait)
+    time.sleep(0.1)
+
+    assert queue.get(job.id).status == jobs.TIMED_OUT
+    assert job.cancel_event.is_set()
+    release.set()
+    queue.shutdown()
+    # The late result is discarded
+    assert job.status == jobs.TIMED_OUT
+    assert job.result is None
+
+
+def test_unknown_job_returns_none(queue):
+    assert queue.get("missing") is None
+    assert queue.cancel("missing") is False
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+import json_stream
+
+
+RECIPE = {
+    "title": 'Soup {with} "quotes"',
+    "servings": 2,
+    "ingredients": [{"name": "salt", "quantity": "1 tsp"}, {"name": "water"}],
+    "steps": ["boil", "season"],
+    "nutrition": {"calories": 120, "fat_grams": 1.5},
+    "vegan": True,
+}
+
+
+def _feed_all(text, size):
+    parser = json_stream.IncrementalJSONParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i : i + size]))
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 5, 10000])
+def test_events_in_document_order(size):
+    parser, events = _feed_all(json.dumps(RECIPE), size)
+
+    assert [(e.kind, e.key) for e in events] == [
+        ("field", "title"),
+        ("field", "servings"),
+        ("item", "ingredients"),
+        ("item", "ingredients"),
+        ("field", "ingredients"),
+        ("item", "steps"),
+        ("item", "steps"),
+        ("field", "steps"),
+        ("field", "nutrition"),
+        ("field", "vegan"),
+    ]
+    assert events[2].value == {"name": "salt", "quantity": "1 tsp"}
+    assert parser.finish() == RECIPE
+
+
+def test_title_is_emitted_before_object_closes():
+    parser = json_stream.IncrementalJSONParser()
+    events = parser.feed('{"title": "Fast", "ingredients": [{"name": "eg')
+
+    assert events == [json_stream.ParseEvent("field", "title", "Fast")]
+    assert parser.done is False
+
+
+def test_surrounding_text_is_ignored():
+    text = "Sure!\n```json\n" + json.dumps(RECIPE) + "\n```\nEnjoy {not json}"
+    parser, _ = _feed_all(text, 7)
+    assert parser.finish() == RECIPE
+
+
+def test_finish_without_repair_raises_on_incomplete_object():
+    parser = json_stream.IncrementalJSONParser()
+    parser.feed('{"title": "Cut off", "steps": ["one"')
+    with pytest.raises(ValueError):
+        parser.finish(repair=False)
+
+
+def test_finish_raises_when_no_object_found():
+    parser = json_stream.IncrementalJSONParser()
+    parser.feed("Sorry, I can't help with that.")
+    with pytest.raises(ValueError):
+        parser.finish()
+
+
+def test_truncated_output_is_closed_and_reported():
+    parser = json_stream.IncrementalJSONParser()
+    events = parser.feed(
+        '{"title": "Soup", "ingredients": [{"name": "salt"}, {"name": "pep'
+    )
+    assert [e.kind for e in events] == ["field", "item"]
+
+    events = parser.close()
+    assert events[0] == json_stream.ParseEvent("item", "ingredients", {"name": "pep"})
+    assert parser.result == {
+        "title": "Soup",
+        "ingredients": [{"name": "salt"}, {"name": "pep"}],
+    }
+    assert "closed unterminated string" in parser.fixes
+    assert "closed 3 unterminated container(s)" in parser.fixes
+
+
+@pytest.mark.parametrize(
+    "text, expected, fix",
+    [
+        (
+            '{"steps": ["a", "b",], "x": 1,}',
+            {"steps": ["a", "b"], "x": 1},
+            "removed trailing comma",
+        ),
+        ('{"steps": ["a" "b"]}', {"steps": ["a", "b"]}, "inserted missing comma"),
+        ('{"title": "A" "x": 1}', {"title": "A", "x": 1}, "inserted missing comma"),
+        (
+            '{"title": "A", "servings": }',
+            {"title": "A"},
+            "dropped key 'servings' without a value",
+        ),
+        (
+            '{"title": "A", "servings": 4',
+            {"title": "A", "servings": 4},
+            "closed 1 unterminated container(s)",
+        ),
+        (
+            '{"title": "A", "servings": tr',
+            {"title": "A"},
+            "dropped truncated value 'tr'",
+        ),
+        ('{"title": "A", "ste', {"title": "A"}, "dropped truncated key"),
+        (
+            '{"title": "A", "steps": ["a",',
+            {"title": "A", "steps": ["a"]},
+            "removed trailing comma",
+        ),
+        (
+            '{"title": "Line 1\nLine 2"}',
+            {"title": "Line 1\nLine 2"},
+            "kept raw control character inside a string",
+        ),
+        ('{"vegan": True}', {"vegan": True}, "converted literal True to JSON"),
+    ],
+)
+def test_common_defects_are_repaired(text, expected, fix):
+    for size in (1, len(text)):
+        parser, _ = _feed_all(text, size)
+        assert parser.finish() == expected
+        assert fix in parser.fixes
+
+
+def test_parse_json_object_returns_fixes():
+    data, fixes = json_stream.parse_json_object('{"a": [1, 2,]}')
+    assert data == {"a": [1, 2]}
+    assert fixes == ["removed trailing comma"]
+
+    data, fixes = json_stream.parse_json_object('{"a": 1}')
+    assert fixes == []
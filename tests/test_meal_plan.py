@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from meal_plan import MealPlanner, merge_shopping_lists, split_meal_requests
+
+
+def recipe(*names):
+    return {
+        "title": " ".join(names),
+        "ingredients": [{"name": n, "quantity": "1", "unit": "cup"} for n in names],
+        "steps": ["cook"],
+    }
+
+
+@pytest.fixture
+def planner():
+    p = MealPlanner(max_workers=4, call_timeout_seconds=2.0)
+    yield p
+    p.shutdown(wait=False)
+
+
+def test_split_meal_requests():
+    raw = "Monday soup\n\n  Tuesday curry \nWednesday pasta\n"
+    assert split_meal_requests(raw, 2) == ["Monday soup", "Tuesday curry"]
+
+
+def test_merge_shopping_lists_by_normalized_name():
+    merged = merge_shopping_lists(
+        [
+            [{"name": "Tomatoes", "quantity": "2"}, {"name": "rice"}],
+            [{"name": "tomatoes", "quantity": "1", "unit": "can"}],
+        ]
+    )
+    by_name = {item["name"]: item for item in merged}
+    assert set(by_name) == {"Tomatoes", "rice"}
+    assert by_name["Tomatoes"]["quantity"] == "2 + 1 can"
+    assert by_name["Tomatoes"]["meals"] == [0, 1]
+    assert by_name["rice"]["meals"] == [0]
+
+
+def test_plan_runs_meals_concurrently(planner):
+    def generate(meal):
+        time.sleep(0.2)
+        return recipe(meal, "garlic")
+
+    start = time.perf_counter()
+    plan = planner.plan(["onion", "leek", "kale", "pea"], ["garlic"], generate)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+    assert [m["recipe"]["title"] for m in plan["meals"]] == [
+        "onion garlic",
+        "leek garlic",
+        "kale garlic",
+        "pea garlic",
+    ]
+    assert all(m["have_items"][0]["name"] == "garlic" for m in plan["meals"])
+    assert sorted(i["name"] for i in plan["shopping_list"]) == [
+        "kale",
+        "leek",
+        "onion",
+        "pea",
+    ]
+
+
+def test_plan_reports_failures_and_timeouts():
+    planner = MealPlanner(max_workers=3, call_timeout_seconds=0.2)
+    release = threading.Event()
+
+    def generate(meal):
+        if meal == "slow":
+            release.wait(5)
+        if meal == "broken":
+            raise RuntimeError("model error")
+        return recipe("salt")
+
+    try:
+        plan = planner.plan(["ok", "slow", "broken"], [], generate)
+    finally:
+        release.set()
+        planner.shutdown()
+
+    ok, slow, broken = plan["meals"]
+    assert ok["recipe"]["title"] == "salt"
+    assert slow["recipe"] is None and "timed out" in slow["error"]
+    assert broken["error"] == "model error"
+    assert [i["name"] for i in plan["shopping_list"]] == ["salt"]
+    stats = planner.stats()
+    assert stats["timed_out"] == 1 and stats["failed"] == 1
@@ -0,0 +1,74 @@
+import os
+
+from flask import Flask
+
+import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("t_seconds", "Test.", ["op"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, op="read")
+
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP t_seconds Test.", "# TYPE t_seconds histogram"]
+    assert 't_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{op="read",le="1.0"} 3' in lines
+    assert 't_seconds_bucket{op="read",le="+Inf"} 4' in lines
+    assert 't_seconds_sum{op="read"} 4.05' in lines
+    assert 't_seconds_count{op="read"} 4' in lines
+    assert histogram.count(op="read") == 4
+
+
+def test_counter_escapes_label_values():
+    counter = metrics.Counter("t_total", "Test.", ["path"])
+    counter.inc(path='a"b')
+    counter.inc(2, path='a"b')
+    assert counter.render()[-1] == 't_total{path="a\\"b"} 3.0'
+
+
+def test_stages_reach_server_timing_and_metrics():
+    app = Flask(__name__)
+    metrics.init_app(app, server_timing=lambda: True)
+
+    @app.route("/work")
+    def work():
+        with metrics.stage("t_parse"):
+            pass
+        with metrics.stage("t_model"):
+            pass
+        with metrics.stage("t_parse"):
+            pass
+        return "ok"
+
+    before = metrics.STAGE_SECONDS.count(stage="t_parse")
+    response = app.test_client().get("/work")
+    entries = [e.split(";")[0] for e in response.headers["Server-Timing"].split(", ")]
+    assert entries == ["t_parse", "t_model", "total"]
+    assert metrics.STAGE_SECONDS.count(stage="t_parse") == before + 2
+    assert 'endpoint="work",method="GET",status="200"' in metrics.render()
+
+
+def test_server_timing_can_be_withheld():
+    app = Flask(__name__)
+    metrics.init_app(app, server_timing=lambda: False)
+    app.add_url_rule("/", "index", lambda: "ok")
+    assert "Server-Timing" not in app.test_client().get("/").headers
+
+
+def test_profiler_keeps_only_slow_requests(tmp_path):
+    profiler = metrics.SlowRequestProfiler(
+        str(tmp_path), sample_rate=1.0, threshold_seconds=0.5, max_files=2
+    )
+    profile = profiler.start()
+    assert profile is not None
+    # Only one request is profiled at a time
+    assert profiler.start() is None
+    assert profiler.stop(profile, 0.1, "fast") is None
+    assert not list(tmp_path.iterdir())
+
+    for n in range(3):
+        path = profiler.stop(profiler.start(), 0.9, f"slow/{n}")
+        assert os.path.exists(path) and path.endswith(f"slow_{n}.prof")
+    assert len(list(tmp_path.iterdir())) == 2
+    assert profiler.stats()["sampled"] == 4 and profiler.stats()["dumped"] == 3
@@ -0,0 +1,60 @@
+import threading
+
+from model_registry import ModelRegistry
+
+
+class FakeModel:
+    instances = 0
+
+    def __init__(self, model_name):
+        FakeModel.instances += 1
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        return prompt.upper()
+
+
+def test_concurrent_get_builds_one_client():
+    registry = ModelRegistry()
+    FakeModel.instances = 0
+    clients = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        clients.append(registry.get(FakeModel, model_name="m"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert FakeModel.instances == 1
+    assert all(c is clients[0] for c in clients)
+
+
+def test_proxy_records_calls_and_passes_attributes():
+    registry = ModelRegistry()
+    client = registry.get(FakeModel, model_name="m")
+    assert client.model_name == "m"
+    assert client.generate_content("hi") == "HI"
+    client.generate_content("again")
+
+    stats = registry.stats()["default"]
+    assert stats["calls"] == 2
+    assert stats["first_call_ms"] >= 0
+    assert stats["construction_ms"] >= 0
+
+
+def test_slots_are_independent_and_clear_resets():
+    registry = ModelRegistry()
+    a = registry.get(FakeModel, model_name="a")
+    b = registry.get(FakeModel, slot="planner", model_name="b")
+    assert a is not b
+    assert registry.get(FakeModel, model_name="a") is a
+    assert set(registry.stats()) == {"default", "planner"}
+
+    registry.clear()
+    assert registry.stats() == {}
+    assert registry.get(FakeModel, model_name="a") is not a
@@ -0,0 +1,67 @@
+import random
+import re
+
+import pytest
+
+import normalizer
+
+
+def legacy_normalize_name(name):
+    """The three-regex implementation normalizer.py replaced."""
+    s = name.lower().strip()
+    s = re.sub(r"[()\[\]{}]", " ", s)
+    s = re.sub(r"[^a-z0-9\s\-]", "", s)
+    s = re.sub(r"\s+", " ", s)
+    if s.endswith("s") and len(s) > 2:
+        s = s[:-1]
+    return s.strip()
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "",
+        "   ",
+        "Tomatoes",
+        "  Garlic cloves.  ",
+        "Fresh-basil!!",
+        "(tomatoes)",
+        "tomatoes (diced)",
+        "[eggs]s",
+        " as",
+        "(as",
+        "a s",
+        "ss",
+        "Crème fraîche",
+        "JALAPEÑOS",
+        "İstanbul spices",
+        "tab\tseparated\nnames",
+        "non breaking spaces",
+        "{{}}",
+        "1/2 cups",
+    ],
+)
+def test_matches_legacy_implementation(name):
+    assert normalizer.normalize_name(name) == legacy_normalize_name(name)
+
+
+def test_matches_legacy_on_random_input():
+    rnd = random.Random(1234)
+    alphabet = list("aAsSzZ09 -()[]{}.,!'\"\t\n éİß") + ["s", " "]
+    for _ in range(20000):
+        name = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 10)))
+        assert normalizer._normalize(name) == legacy_normalize_name(name), name
+
+
+def test_normalize_many_and_memo():
+    normalizer.normalize_name.cache_clear()
+    names = ["Onions", "onions", "Onions", "Garlic"]
+
+    assert normalizer.normalize_many(names) == ["onion", "onion", "onion", "garlic"]
+    info = normalizer.normalize_name.cache_info()
+    assert info.hits == 1
+    assert info.maxsize == normalizer.CACHE_SIZE
+
+
+def test_split_ingredients():
+    assert normalizer.split_ingredients("a, b\nc") == ["a", " b", "c"]
@@ -0,0 +1,60 @@
+import recipe_service
+from pantry_index import PantryIndex
+
+
+def test_match_uses_containment_in_both_directions():
+    index = PantryIndex(["tomatoe", "onion", "garlic clove"], aliases={})
+
+    assert index.match("onion") == "onion"  # exact
+    assert index.match("red onion") == "onion"  # pantry item inside ingredient
+    assert index.match("garlic") == "garlic clove"  # ingredient inside pantry item
+    assert index.match("olive oil") is None
+
+
+def test_overlapping_patterns_are_found():
+    # "she" only matches through the automaton's failure links
+    index = PantryIndex(["he", "she", "hers"], aliases={})
+    assert index.match("ushers") is not None
+    assert index.match("xsh") is None
+
+
+def test_aliases_match_either_spelling():
+    index = PantryIndex(["green onion", "aubergine"])
+
+    assert index.match("scallion") == "green onion"
+    assert index.match("chopped scallion") == "green onion"
+    assert index.match("eggplant") == "aubergine"
+
+    reverse = PantryIndex(["scallion"])
+    assert reverse.match("spring onion") == "scallion"
+
+
+def test_custom_alias_table():
+    index = PantryIndex(["courgette"], aliases={"zucchini": ["courgette"]})
+    assert index.match("zucchini") == "courgette"
+
+    no_aliases = PantryIndex(["courgette"], aliases={})
+    assert no_aliases.match("zucchini") is None
+
+
+def test_empty_pantry_and_empty_name():
+    assert PantryIndex([]).match("salt") is None
+    assert PantryIndex([]).match("") is None
+    # Matches the previous behaviour: "" is contained in any pantry name
+    assert PantryIndex(["salt"]).match("") == "salt"
+
+
+def test_index_is_reusable_across_recipes():
+    index = PantryIndex(recipe_service.parse_available_ingredients("rice, scallions"))
+    assert len(index) == 2
+
+    shopping, have = recipe_service.diff_shopping_list(
+        [{"name": "Green onions"}, {"name": "soy sauce"}], [], index=index
+    )
+    assert [i["name"] for i in have] == ["Green onions"]
+    assert [i["name"] for i in shopping] == ["soy sauce"]
+
+    shopping, have = recipe_service.diff_shopping_list(
+        [{"name": "brown rice"}], [], index=index
+    )
+    assert have == [{"name": "brown rice"}]
@@ -0,0 +1,40 @@
+import pytest
+
+from password_hasher import HasherBusy, PasswordHasher
+
+
+@pytest.fixture
+def pooled():
+    hasher = PasswordHasher(iterations=1000, max_workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify_in_worker_process(pooled):
+    pwhash = pooled.hash("secret")
+    assert pwhash.startswith("pbkdf2:sha256:1000$")
+    assert pooled.verify(pwhash, "secret") is True
+    assert pooled.verify(pwhash, "nope") is False
+
+    stats = pooled.stats()
+    assert stats["hash"] == 1 and stats["verify"] == 2
+    assert stats["verify_p95_ms"] >= 0
+
+
+def test_needs_rehash_on_cost_change():
+    hasher = PasswordHasher(iterations=1000, max_workers=0)
+    assert not hasher.needs_rehash(hasher.hash("pw"))
+    assert PasswordHasher(iterations=2000, max_workers=0).needs_rehash(
+        hasher.hash("pw")
+    )
+    assert hasher.needs_rehash("scrypt:32768:8:1$salt$hash")
+
+
+def test_rejects_when_queue_is_full(pooled):
+    assert pooled._slots.acquire(blocking=False)
+    try:
+        with pytest.raises(HasherBusy):
+            pooled.hash("pw")
+    finally:
+        pooled._slots.release()
+    assert pooled.stats()["rejected"] == 1
@@ -0,0 +1,73 @@
+import pytest
+
+from rate_limit import (
+    MemoryStore,
+    Policy,
+    RateLimiter,
+    SQLiteStore,
+    parse_policy,
+    sliding_window,
+)
+
+
+def test_parse_policy():
+    assert parse_policy("10/60") == Policy(10, 60.0)
+    assert parse_policy(" 5 ") == Policy(5, 60.0)
+    assert parse_policy("") is None
+    assert parse_policy("0") is None
+
+
+def test_sliding_window_blocks_and_reports_retry_after():
+    policy = Policy(3, 10.0)
+    state = None
+    for _ in range(3):
+        state, retry = sliding_window(state, policy, 100.5)
+        assert retry is None
+    same, retry = sliding_window(state, policy, 101.0)
+    assert same == state
+    # Three hits in the current window: the roll-over at 110 alone is not
+    # enough, one third of the next window has to slide past as well.
+    assert retry == pytest.approx(9.0 + 10.0 / 3)
+
+
+def test_sliding_window_weighs_previous_window():
+    policy = Policy(4, 10.0)
+    state = None
+    for _ in range(4):
+        state, _ = sliding_window(state, policy, 105.0)
+    # At 112 the previous window still counts 80%: 4 * 0.8 = 3.2 -> 4.2 > 4
+    _, retry = sliding_window(state, policy, 112.0)
+    assert retry == pytest.approx(0.5)
+    _, retry = sliding_window(state, policy, 112.5)
+    assert retry is None
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / "ratelimit.db"))
+
+
+def test_limiter_checks_every_identity(store):
+    limiter = RateLimiter({"login": Policy(2, 60.0)}, store=store)
+    assert limiter.hit("login", ["ip:1"]) is None
+    assert limiter.hit("login", ["ip:1", "user:a"]) is None
+    assert limiter.hit("login", ["ip:1"]) > 0
+    # Same user from another address is still limited per user only after 2
+    assert limiter.hit("login", ["ip:2", "user:a"]) is None
+    assert limiter.hit("login", ["ip:3", "user:a"]) > 0
+    assert limiter.hit("unlimited", ["ip:1"]) is None
+
+    stats = limiter.stats()["login"]
+    assert stats == {"allowed": 3, "limited": 2, "limit": 2, "window_seconds": 60.0}
+
+
+def test_memory_store_evicts_idle_keys():
+    store = MemoryStore(sweep_seconds=0)
+    policy = Policy(1, 10.0)
+    store.hit("a", policy, 100.0)
+    store.hit("b", policy, 115.0)
+    assert len(store) == 2
+    store.hit("c", policy, 125.0)
+    assert len(store) == 2  # "a" expired at 120
@@ -2,6 +2,7 @@ import json
 import types
 
 import recipe_service
+from model_registry import ModelRegistry
 
 
 def test_get_model(monkeypatch):
@@ -105,3 +106,128 @@ def test_safe_json_from_text():
     data2 = recipe_service.safe_json_from_text(wrapped)
     assert data2["title"] == "Soup"
     assert data2["steps"] == ["boil"]
+
+
+def test_request_cache_key_is_canonical():
+    key = recipe_service.request_cache_key(
+        "Pasta  with Tomato", ["garlic", "basil"], "2", "Italian", "30 minutes"
+    )
+    same = recipe_service.request_cache_key(
+        " pasta with tomato ",
+        ["basil", "garlic", "basil"],
+        "2 ",
+        "italian",
+        "30 Minutes",
+    )
+    different = recipe_service.request_cache_key(
+        "pasta with tomato", ["basil"], "2", "italian", "30 minutes"
+    )
+    assert key == same
+    assert key != different
+
+
+def test_safe_json_from_text_repairs_malformed_output():
+    truncated = '{"title": "Stew", "ingredients": [{"name": "beef"}, {"name": "car'
+    data = recipe_service.safe_json_from_text(truncated)
+    assert data["title"] == "Stew"
+    assert data["ingredients"] == [{"name": "beef"}, {"name": "car"}]
+
+    recipe, fixes = recipe_service.parse_recipe_json(
+        '{"title": "Soup", "steps": ["boil",],}'
+    )
+    assert recipe == {"title": "Soup", "steps": ["boil"]}
+    assert fixes == ["removed trailing comma"]
+
+
+def test_get_model_reuses_client_until_model_changes(monkeypatch):
+    built = []
+
+    class FakeModel:
+        def __init__(self, model_name, system_instruction):
+            built.append(model_name)
+
+        def generate_content(self, prompt, **kwargs):
+            return types.SimpleNamespace(text="{}")
+
+    monkeypatch.setattr(
+        recipe_service, "genai", types.SimpleNamespace(GenerativeModel=FakeModel)
+    )
+    monkeypatch.setattr(recipe_service, "MODEL_REGISTRY", ModelRegistry())
+    monkeypatch.setenv("GEMINI_MODEL", "model-a")
+
+    first = recipe_service.get_model()
+    assert recipe_service.get_model() is first
+    assert built == ["model-a"]
+
+    first.generate_content("hi")
+    stats = recipe_service.MODEL_REGISTRY.stats()["default"]
+    assert stats["model_name"] == "model-a"
+    assert stats["calls"] == 1
+    assert stats["first_call_ms"] is not None
+
+    monkeypatch.setenv("GEMINI_MODEL", "model-b")
+    second = recipe_service.get_model()
+    assert second is not first
+    assert built == ["model-a", "model-b"]
+    stats = recipe_service.MODEL_REGISTRY.stats()["default"]
+    assert stats["model_name"] == "model-b"
+    assert stats["reloads"] == 1
+    assert stats["calls"] == 0
+
+
+def test_build_prompt_without_schema():
+    prompt = recipe_service.build_prompt(
+        "Pasta", ["garlic"], "", "", "", include_schema=False
+    )
+    assert json.dumps(recipe_service.RECIPE_JSON_SCHEMA) not in prompt
+    assert prompt.startswith(recipe_service.PROMPT_PREFIX)
+    assert "User request: Pasta" in prompt
+    assert prompt.endswith(
+        "Return ONLY JSON. No markdown, no code fences, no commentary."
+    )
+
+
+def test_build_prompt_budget_keeps_query_mentions_first():
+    pantry = [f"item{i:03d}" for i in range(200)] + ["basil", "garlic"]
+    prompt, stats = recipe_service.build_prompt_with_stats(
+        "Garlic pasta with basil",
+        pantry + ["garlic"],
+        "2",
+        "",
+        "",
+        include_schema=False,
+        max_chars=600,
+    )
+    assert len(prompt) <= 600
+    assert stats["chars"] == len(prompt)
+    assert stats["pantry_dropped"] > 0
+    line = next(p for p in prompt.splitlines() if p.startswith("These ingredients"))
+    assert line.split(": ", 1)[1].startswith("basil, garlic, item000")
+    assert "Target servings: 2" in prompt
+
+
+def test_build_prompt_budget_shortens_long_query():
+    prompt, stats = recipe_service.build_prompt_with_stats(
+        "x" * 5000, ["garlic"], "", "", "", include_schema=False, max_chars=800
+    )
+    assert len(prompt) <= 800
+    assert stats["pantry_items"] == 0
+
+
+def test_lazy_genai_defers_import_and_replays_configure(monkeypatch):
+    lazy = recipe_service._LazyGenAI()
+    configured = []
+    fake_sdk = types.SimpleNamespace(
+        configure=lambda **kwargs: configured.append(kwargs), GenerativeModel=dict
+    )
+    monkeypatch.setattr(lazy, "_import", lambda: fake_sdk)
+
+    lazy.configure(api_key="k")
+    assert not lazy.loaded and configured == []
+
+    assert lazy.GenerativeModel is dict
+    assert lazy.loaded
+    assert configured == [{"api_key": "k"}]
+
+    lazy.configure(api_key="k2")
+    assert configured[-1] == {"api_key": "k2"}
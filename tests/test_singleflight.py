@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import singleflight
+
+
+def run_concurrently(flights, key, fn, count, timeout=None):
+    """Start ``count`` callers once the leader is inside ``fn``."""
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        leader = pool.submit(flights.do, key, fn, timeout)
+        while flights.stats()["in_flight"] == 0:
+            time.sleep(0.001)
+        others = [pool.submit(flights.do, key, fn, timeout) for _ in range(count - 1)]
+        return leader, others
+
+
+def test_duplicates_share_one_call():
+    flights = singleflight.SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"title": "Soup"}
+
+    leader, others = run_concurrently(flights, "k", fn, 5)
+    while flights.stats()["waiters"] < 4:
+        time.sleep(0.001)
+    release.set()
+
+    assert leader.result() == ({"title": "Soup"}, False)
+    assert [f.result() for f in others] == [({"title": "Soup"}, True)] * 4
+    assert len(calls) == 1
+    stats = flights.stats()
+    assert stats["calls"] == 1 and stats["coalesced"] == 4
+    assert stats["saved_ratio"] == 0.8 and stats["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_next_call_retries():
+    flights = singleflight.SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("model down")
+
+    leader, others = run_concurrently(flights, "k", fail, 3)
+    while flights.stats()["waiters"] < 2:
+        time.sleep(0.001)
+    release.set()
+
+    for future in [leader, *others]:
+        with pytest.raises(ValueError, match="model down"):
+            future.result()
+    stats = flights.stats()
+    assert stats["errors"] == 1 and stats["shared_errors"] == 2
+
+    # A finished flight is forgotten; the next caller runs fn again
+    assert flights.do("k", lambda: "ok") == ("ok", False)
+
+
+def test_waiter_timeout_leaves_leader_running():
+    flights = singleflight.SingleFlight(timeout_seconds=0.05)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "done"
+
+    leader, (waiter,) = run_concurrently(flights, "k", slow, 2)
+    with pytest.raises(singleflight.FlightTimeout):
+        waiter.result()
+    release.set()
+    assert leader.result() == ("done", False)
+    assert flights.stats()["timeouts"] == 1
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    flights = singleflight.SingleFlight()
+    release = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        blocked = pool.submit(flights.do, "a", lambda: release.wait(5))
+        assert flights.do("b", lambda: 2) == (2, False)
+        release.set()
+        assert blocked.result() == (True, False)
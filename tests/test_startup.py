@@ -0,0 +1,43 @@
+import time
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+import startup
+
+
+def test_startup_timer_phases_and_marks():
+    timer = startup.StartupTimer()
+    with timer.phase("db"):
+        time.sleep(0.01)
+    timer.mark("rest")
+    timer.record("model", 0.5, background=True)
+
+    report = timer.report()
+    assert list(report["phases_ms"]) == ["db", "rest"]
+    assert report["phases_ms"]["db"] >= 10
+    assert report["background_ms"] == {"model": 500.0}
+    # Phases are rounded individually, so the sum may be off by a rounding step
+    assert report["total_ms"] == pytest.approx(
+        sum(report["phases_ms"].values()), abs=0.002
+    )
+
+
+def test_precompile_templates_writes_bytecode_cache(tmp_path):
+    env = Environment(
+        loader=DictLoader({"a.html": "{{ x }}", "b.html": "hi", "notes.txt": "skip"})
+    )
+    cache_dir = tmp_path / "jinja"
+    assert startup.precompile_templates(env, str(cache_dir)) == 2
+    assert len(list(cache_dir.iterdir())) == 2
+
+    # A new environment loads the cached bytecode instead of compiling
+    fresh = Environment(loader=env.loader)
+    startup.precompile_templates(fresh, str(cache_dir))
+    assert fresh.get_template("a.html").render(x=1) == "1"
+
+
+def test_warm_in_background_records_duration():
+    timer = startup.StartupTimer()
+    startup.warm_in_background(lambda: time.sleep(0.01), timer, name="model").join()
+    assert timer.report()["background_ms"]["model"] >= 10